@@ -1,10 +1,515 @@
 import random
-import matplotlib.pyplot as plt
+import argparse
+import numpy as np
 
 import os
+import sys
+import json
+import copy
+import bisect
+import functools
+import hashlib
+import time
+import logging
+import contextlib
+import inspect
+import threading
+import queue
+import http.server
+import multiprocessing
+from multiprocessing import shared_memory
+
+logger = logging.getLogger("TSP")
+if not logger.handlers:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+
+worker_tsp = None #per process TSP shell holding the shared distances, set up by attach_worker_distances.
+
+def attach_worker_distances(settings, shared_name, distance_file) -> None:
+    """
+    Pool initializer, attaches the distances of the parent either through its shared memory block or its memmap file.
+    settings holds the TSP attributes the workers need to score routes.
+    """
+    global worker_tsp
+    worker_tsp = TSP.__new__(TSP)
+    for field, value in settings.items():
+        setattr(worker_tsp, field, value)
+    if distance_file is not None:
+        worker_tsp.distances = np.lib.format.open_memmap(distance_file, mode="r")
+        return
+    if shared_name is None:
+        return #lazy distances are computed from the coordinates held in settings.
+    worker_tsp.shared = shared_memory.SharedMemory(name=shared_name)
+    worker_tsp.distances = np.ndarray(settings["distance_shape"], dtype=settings["distance_dtype"], buffer=worker_tsp.shared.buf)
+
+def score_population_chunk(chunk) -> np.ndarray:
+    """
+    Pool task, returns the tour lengths of a contiguous chunk of the population matrix.
+    """
+    return worker_tsp.compute_population_lengths(chunk)
+
+def live_plot_loop(queue, coordinates, fps, points) -> None:
+    """
+    Live plotting process target, draws the batches of (generation, best distance, average distance, diversity) rows
+    and the improving best paths sent by TSP.publish_plot until it receives None.
+    The figure is redrawn at most fps times per second, and the history is halved whenever it outgrows points,
+    every later row then being kept at the doubled stride, so a redraw costs the same however long the run.
+    """
+    import matplotlib.pyplot as plt
+
+    plt.ion()
+    figure, (progress, tour) = plt.subplots(1, 2, figsize=(14, 6))
+    best_line, = progress.plot([], [], color='b', label='Best Distance')
+    average_line, = progress.plot([], [], color='r', label='Average Distance')
+    progress.set_title('Distance over Generations')
+    progress.set_xlabel('Generation')
+    progress.set_ylabel('Distance')
+    progress.grid(True)
+    progress.legend()
+    tour_line, = tour.plot([], [], '-o', markersize=3)
+    tour.set_title('Best Path')
+    tour.set_xlabel('X' if coordinates is not None else 'City Index')
+    tour.set_ylabel('Y' if coordinates is not None else 'City Order in Path')
+
+    history, stride, seen = list(), 1, 0
+    last_draw = 0.0
+    running = True
+    while running:
+        batch = list()
+        try:
+            batch.append(queue.get(timeout=1.0 / fps))
+            while True:
+                batch.append(queue.get_nowait())
+        except Exception:
+            pass
+        for message in batch:
+            if message is None:
+                running = False
+                break
+            rows, path, distance = message
+            for row in rows:
+                if seen % stride == 0:
+                    history.append(row)
+                seen = seen + 1
+                if len(history) > points:
+                    history, stride = history[::2], stride * 2
+            if path is not None:
+                if coordinates is not None:
+                    x, y = coordinates[np.append(path, path[0])].T
+                else:
+                    x, y = np.arange(len(path)), path
+                tour_line.set_data(x, y)
+                tour.set_title('Best Path: Distance = %.2f'%(distance))
+                tour.relim()
+                tour.autoscale_view()
+
+        if history and (not running or time.perf_counter() - last_draw >= 1.0 / fps):
+            columns = np.array(history)
+            best_line.set_data(columns[:, 0], columns[:, 1])
+            average_line.set_data(columns[:, 0], columns[:, 2])
+            progress.relim()
+            progress.autoscale_view()
+            figure.canvas.draw_idle()
+            last_draw = time.perf_counter()
+        plt.pause(0.001)
+    plt.ioff()
+    plt.show()
+
+def run_island(tsp, island, seed, inboxes, results) -> None:
+    """
+    Island process target, evolves its own copy of tsp and reports (island, (generations, best path, best distance), None),
+    or (island, None, error message) when the island failed.
+    """
+    try:
+        tsp.rng = np.random.default_rng(seed)
+        results.put((island, tsp.evolve_island(island, inboxes), None))
+    except Exception as e:
+        results.put((island, None, "%s: %s"%(type(e).__name__, e)))
+
+
+class StatsHistory():
+    """
+    Fixed size ring buffer holding the statistics of the last capacity generations in a structured array,
+    every row can also be streamed to an append only csv file.
+    Only the routes that improved on the best distance so far are kept, and only as far back as the oldest buffered row needs,
+    so memory does not grow with the length of the run.
+    Rows read back as the dicts of get_population_results, their best_path being the best route found up to that generation.
+    """
+    fields = ("generation", "best_distance", "best_fitness", "average_distance", "std_distance", "average_fitness", "diversity")
+
+    def __init__(self, capacity = 10000, csv_file = None) -> None:
+        self.rows = np.full(capacity, np.nan, dtype=[(field, np.float64) for field in self.fields])
+        self.count = 0 #rows appended so far, the buffer keeps the last capacity of them.
+        self.best_rows = list() #row number of every improving route.
+        self.best_paths = list()
+        self.best_distance = np.inf
+        self.csv_file = csv_file
+        self.csv = None
+
+    def append(self, stats) -> None:
+        """
+        This method stores the stats of a generation, the best route is only kept when it improves on the best distance so far.
+        """
+        stats = dict(stats, generation=stats.get("generation", self.count + 1))
+        self.rows[self.count % len(self.rows)] = tuple(stats.get(field, np.nan) for field in self.fields)
+        if stats["best_distance"] < self.best_distance:
+            path = stats["best_path"]
+            if isinstance(path, str):
+                path = path.split(',')
+            self.best_rows.append(self.count)
+            self.best_paths.append(np.array(path, dtype=np.int32))
+            self.best_distance = stats["best_distance"]
+        if self.csv_file is not None:
+            if self.csv is None:
+                new_file = not os.path.exists(self.csv_file) or os.path.getsize(self.csv_file) == 0
+                self.csv = open(self.csv_file, "a")
+                if new_file:
+                    self.csv.write(",".join(self.fields) + "\n")
+            self.csv.write(",".join([str(int(stats["generation"]))] + [repr(float(stats.get(field, np.nan))) for field in self.fields[1:]]) + "\n")
+        self.count = self.count + 1
+        k = bisect.bisect_right(self.best_rows, self.count - len(self)) - 1 #last improvement at or before the oldest buffered row.
+        if k > 0:
+            del self.best_rows[:k]
+            del self.best_paths[:k]
+
+    def __len__(self) -> int:
+        return min(self.count, len(self.rows))
+
+    def __getitem__(self, k) -> dict:
+        if k < 0:
+            k = k + len(self)
+        if not 0 <= k < len(self):
+            raise IndexError("generation stats index out of range")
+        row_number = self.count - len(self) + k
+        row = self.rows[row_number % len(self.rows)]
+        stats = {field: float(row[field]) for field in self.fields}
+        stats["generation"] = int(stats["generation"])
+        stats["best_path"] = self.best_path(row_number)
+        return stats
+
+    def __iter__(self):
+        for k in range(len(self)):
+            yield self[k]
+
+    def best_path(self, row_number = None) -> str:
+        """
+        This method returns the best route found up to the given row number (the latest row by default), joined with commas.
+        """
+        row_number = self.count - 1 if row_number is None else row_number
+        k = bisect.bisect_right(self.best_rows, row_number) - 1
+        if k < 0:
+            return ""
+        return ','.join(str(i) for i in self.best_paths[k].tolist())
+
+    def column(self, field) -> np.ndarray:
+        """
+        This method returns one statistic of the buffered generations, oldest first.
+        """
+        if self.count <= len(self.rows):
+            return self.rows[field][:self.count].copy()
+        return np.roll(self.rows[field], -(self.count % len(self.rows))) #the oldest row sits right after the newest one.
+
+    def to_arrays(self) -> dict:
+        """
+        This method returns the whole history as plain arrays, see from_arrays.
+        stats_csv_offset is the size of the csv file once every appended row is written, -1 without a csv file.
+        """
+        if self.csv is not None:
+            self.csv.flush()
+        if self.csv_file is not None and os.path.exists(self.csv_file):
+            offset = os.path.getsize(self.csv_file)
+        else:
+            offset = -1
+        return {
+            "stats_rows": self.rows,
+            "stats_count": np.array(self.count),
+            "stats_best_rows": np.array(self.best_rows, dtype=np.int64),
+            "stats_best_paths": np.array(self.best_paths, dtype=np.int32),
+            "stats_best_distance": np.array(self.best_distance),
+            "stats_csv_offset": np.array(offset),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, csv_file = None, truncate = False) -> "StatsHistory":
+        """
+        Rebuilds a history saved with to_arrays.
+        truncate tells that csv_file is the file the history was streaming to, the rows written to it after to_arrays are then cut off
+        so they are not written twice once the run carries on.
+        """
+        history = cls(len(arrays["stats_rows"]), csv_file)
+        history.rows[:] = arrays["stats_rows"]
+        history.count = int(arrays["stats_count"])
+        history.best_rows = arrays["stats_best_rows"].tolist()
+        history.best_paths = list(arrays["stats_best_paths"])
+        history.best_distance = float(arrays["stats_best_distance"])
+        offset = int(arrays["stats_csv_offset"])
+        if truncate and csv_file is not None and offset >= 0 and os.path.exists(csv_file) and os.path.getsize(csv_file) > offset:
+            os.truncate(csv_file, offset)
+        return history
+
+    def close(self) -> None:
+        if self.csv is not None:
+            self.csv.close()
+            self.csv = None
+
+    def __getstate__(self) -> dict:
+        state = dict(self.__dict__)
+        state["csv"] = None #open files do not travel to other processes.
+        return state
+
+
+class TourCache():
+    """
+    Bounded cache of tour lengths keyed by the 64 bit tour hash of TSP.tour_hashes, evicted with the clock algorithm:
+    a hit sets the referenced bit of its slot, and the hand looking for a slot to reuse clears the bits it passes until it finds an unreferenced one.
+    The number of slots is derived from a byte budget.
+    """
+    entry_bytes = 128 #estimated cost of an entry, its dict item and its slot in the arrays.
+
+    def __init__(self, budget) -> None:
+        capacity = max(1, int(budget // self.entry_bytes))
+        self.keys = np.zeros(capacity, dtype=np.uint64)
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.referenced = np.zeros(capacity, dtype=bool)
+        self.slots = dict() #tour hash -> slot.
+        self.hand = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def lookup(self, hashes: np.ndarray) -> tuple:
+        """
+        This method returns the cached lengths of hashes, nan for the ones that are missing, along with the mask of the missing ones.
+        """
+        found = np.fromiter((self.slots.get(h, -1) for h in hashes.tolist()), dtype=np.int64, count=len(hashes))
+        hit = found >= 0
+        lengths = np.full(len(hashes), np.nan)
+        lengths[hit] = self.values[found[hit]]
+        self.referenced[found[hit]] = True
+        self.hits = self.hits + int(hit.sum())
+        self.misses = self.misses + int(len(hashes) - hit.sum())
+        return lengths, ~hit
+
+    def store(self, hashes: np.ndarray, lengths: np.ndarray) -> None:
+        capacity = len(self.keys)
+        for h, length in zip(hashes.tolist(), lengths.tolist()):
+            if h in self.slots:
+                continue
+            if len(self.slots) < capacity:
+                slot = len(self.slots)
+            else:
+                while self.referenced[self.hand]:
+                    self.referenced[self.hand] = False
+                    self.hand = (self.hand + 1) % capacity
+                slot = self.hand
+                self.hand = (self.hand + 1) % capacity
+                del self.slots[int(self.keys[slot])]
+            self.keys[slot] = h
+            self.values[slot] = length
+            self.referenced[slot] = False
+            self.slots[h] = slot
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        return "%d hits, %d misses (%.1f%% hit rate), %d of %d tours cached"%(self.hits, self.misses, 100 * self.hits / max(1, total), len(self), len(self.keys))
+
+
+no_stage = contextlib.nullcontext() #stage context of runs without profiling.
+
+class RunMetrics():
+    """
+    High resolution stage timers and counters of a run, along with the callbacks they are handed to after every generation.
+    Stage times are exclusive, a stage running inside another one, e.g. the evaluation of the children inside the crossover, is only counted once.
+    """
+    stages = ("evaluation", "fitness", "selection", "crossover", "mutation", "local_search", "statistics", "checkpoint")
+    counters = ("generations", "evaluations", "valid_children", "invalid_children", "mutations", "cache_hits", "cache_misses")
 
-def clear_screen():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    def __init__(self) -> None:
+        self.seconds = dict.fromkeys(self.stages, 0.0)
+        self.calls = dict.fromkeys(self.stages, 0)
+        self.counts = dict.fromkeys(self.counters, 0)
+        self.nested = list() #time spent in the inner stages of every stage that is running.
+        self.callbacks = list()
+        self.started = time.perf_counter()
+        self.latest = self.snapshot(0, dict()) #last snapshot, read by the metrics endpoint thread.
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        self.nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.seconds[name] = self.seconds[name] + elapsed - self.nested.pop()
+            self.calls[name] = self.calls[name] + 1
+            if self.nested:
+                self.nested[-1] = self.nested[-1] + elapsed
+
+    def count(self, name, k = 1) -> None:
+        self.counts[name] = self.counts[name] + k
+
+    def snapshot(self, generation, stats) -> dict:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "generation": generation,
+            "elapsed": elapsed,
+            "generations_per_second": self.counts["generations"] / elapsed if elapsed > 0 else 0.0,
+            "best_distance": stats.get("best_distance"),
+            "average_distance": stats.get("average_distance"),
+            "diversity": stats.get("diversity"),
+            "stages": {name: {"seconds": self.seconds[name], "calls": self.calls[name]} for name in self.stages},
+            "counters": dict(self.counts),
+        }
+
+    def publish(self, generation, stats) -> dict:
+        """
+        This method closes a generation, takes a snapshot of the metrics and hands it to every callback.
+        """
+        self.count("generations")
+        self.latest = self.snapshot(generation, stats)
+        for callback in self.callbacks:
+            callback(self.latest)
+        return self.latest
+
+    def summary(self) -> str:
+        total = sum(self.seconds.values()) or 1.0
+        return ", ".join("%s %.3fs (%.1f%%)"%(name, self.seconds[name], 100 * self.seconds[name] / total) for name in self.stages if self.calls[name])
+
+    @staticmethod
+    def prometheus(snapshot) -> str:
+        """
+        This method renders a snapshot in the Prometheus text exposition format.
+        """
+        lines, declared = list(), set()
+        def metric(name, kind, value, labels = ""):
+            if value is None:
+                return
+            if name not in declared:
+                declared.add(name)
+                lines.append("# TYPE %s %s"%(name, kind))
+            lines.append("%s%s %s"%(name, labels, value if isinstance(value, int) else repr(float(value))))
+        metric("tsp_generation", "gauge", snapshot["generation"])
+        metric("tsp_elapsed_seconds", "gauge", snapshot["elapsed"])
+        metric("tsp_generations_per_second", "gauge", snapshot["generations_per_second"])
+        metric("tsp_best_distance", "gauge", snapshot["best_distance"])
+        metric("tsp_average_distance", "gauge", snapshot["average_distance"])
+        metric("tsp_diversity", "gauge", snapshot["diversity"])
+        for name, value in snapshot["counters"].items():
+            metric("tsp_%s_total"%(name), "counter", value)
+        for field in ("seconds", "calls"):
+            for name, stage in snapshot["stages"].items():
+                metric("tsp_stage_%s_total"%(field), "counter", stage[field], '{stage="%s"}'%(name))
+        return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the latest metrics snapshot of the run, as Prometheus text on /metrics and as json on /metrics.json.
+    """
+    def do_GET(self) -> None:
+        snapshot = self.server.metrics.latest
+        if self.path.startswith("/metrics.json"):
+            body, kind = json.dumps(snapshot), "application/json"
+        elif self.path.startswith("/metrics"):
+            body, kind = RunMetrics.prometheus(snapshot), "text/plain; version=0.0.4"
+        else:
+            self.send_error(404)
+            return
+        body = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", kind)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass #requests are not worth a line of the run output.
+
+
+class CityGrid():
+    """
+    Uniform grid over the coordinates of a set of cities, about two cities per cell.
+    Nearest neighbour queries search the rings of cells around a point outwards, and stop as soon as no further ring can hold a closer city,
+    so they cost O(1) on average instead of a scan over all the cities. Cities can be removed as they are used up.
+    """
+    def __init__(self, coordinates, cities = None) -> None:
+        cities = np.arange(len(coordinates)) if cities is None else np.asarray(cities)
+        points = coordinates[cities]
+        self.low = points.min(axis=0) if len(points) else np.zeros(2)
+        self.side = max(1, int(np.ceil(np.sqrt(len(points) / 2))))
+        self.cell = max(float((points.max(axis=0) - self.low).max()) / self.side, 1e-12) if len(points) else 1.0
+        cells = self.cell_of(points)
+        order = np.argsort(cells, kind="stable")
+        self.order = cities[order] #cities sorted by cell, the members of cell c are order[starts[c]:starts[c + 1]].
+        self.starts = np.searchsorted(cells[order], np.arange(self.side * self.side + 1))
+        self.members = [self.order[a:b].tolist() for a, b in zip(self.starts[:-1], self.starts[1:])]
+        self.x, self.y = coordinates[:, 0].tolist(), coordinates[:, 1].tolist()
+        self.size = len(cities)
+
+    def cell_of(self, points) -> np.ndarray:
+        column = np.clip(((points[:, 0] - self.low[0]) / self.cell).astype(np.int64), 0, self.side - 1)
+        row = np.clip(((points[:, 1] - self.low[1]) / self.cell).astype(np.int64), 0, self.side - 1)
+        return row * self.side + column
+
+    def remove(self, city) -> None:
+        cell = self.cell_of(np.array([[self.x[city], self.y[city]]]))[0]
+        self.members[cell].remove(city)
+        self.size = self.size - 1
+
+    def nearest(self, city) -> int:
+        """
+        This method returns the city left in the grid that is closest to city, -1 when the grid is empty.
+        """
+        if self.size == 0:
+            return -1
+        x, y = self.x[city], self.y[city]
+        column = min(self.side - 1, max(0, int((x - self.low[0]) / self.cell)))
+        row = min(self.side - 1, max(0, int((y - self.low[1]) / self.cell)))
+        best, best_distance = -1, np.inf
+        for r in range(self.side + 1):
+            for i in range(max(0, row - r), min(self.side, row + r + 1)):
+                step = 1 if abs(i - row) == r else 2 * r #inner rows of the ring only hold its two end cells.
+                for j in range(column - r, column + r + 1, max(1, step)):
+                    if 0 <= j < self.side:
+                        for other in self.members[i * self.side + j]:
+                            distance = (self.x[other] - x) ** 2 + (self.y[other] - y) ** 2
+                            if distance < best_distance and other != city:
+                                best, best_distance = other, distance
+            if best >= 0 and best_distance <= (r * self.cell) ** 2: #cities beyond ring r are at least r cells away.
+                break
+        return best
+
+    def nearest_k(self, k) -> np.ndarray:
+        """
+        This method returns the k nearest cities of every city of the grid, one row per city, unsorted.
+        The cities of a cell are compared at once against the block of cells around it, grown until it holds k cities within its radius.
+        """
+        n = len(self.x)
+        nearest = np.zeros((n, k), dtype=np.int64)
+        points = np.column_stack((self.x, self.y))
+        for cell in np.flatnonzero(np.diff(self.starts)):
+            row, column = divmod(int(cell), self.side)
+            cities = self.order[self.starts[cell]:self.starts[cell + 1]]
+            for r in range(1, max(2, self.side)):
+                first, last = max(0, column - r), min(self.side, column + r + 1)
+                candidates = np.concatenate([self.order[self.starts[i * self.side + first]:self.starts[i * self.side + last]]
+                                             for i in range(max(0, row - r), min(self.side, row + r + 1))])
+                block = ((points[cities, None, :] - points[None, candidates, :]) ** 2).sum(axis=2)
+                block[cities[:, None] == candidates[None, :]] = np.inf #a city is not its own neighbour.
+                if len(candidates) <= k and r < self.side - 1:
+                    continue
+                closest = np.argpartition(block, k - 1, axis=1)[:, :k]
+                if r >= self.side - 1 or np.take_along_axis(block, closest, axis=1).max() <= (r * self.cell) ** 2:
+                    nearest[cities, :k] = candidates[closest]
+                    break
+        return nearest
 
 
 class TSP():
@@ -16,71 +521,482 @@ class TSP():
     child_population = None
     generations = None
     iterations = None
-
-    def __init__(self) -> None:
+    population_mode = "array" #"array" keeps the population as an int32 permutation matrix, "dict" keeps the comma-joined route dicts.
+    population_lengths = None
+    rng = None
+    gather_budget = 1 << 22 #maximum number of matrix cells gathered at once while scoring a population matrix.
+    distance_dtype = np.float64 #np.float32 halves the memory of the distance matrix.
+    distance_storage = "full" #"full" keeps the n x n matrix, "condensed" keeps only the upper triangle as a flat array, "lazy" computes the distances from coordinates on demand.
+    distance_file = None #path of a .npy file backing the distances as a memmap, reused across runs when its .json fingerprint matches.
+    distance_seed = None #seed of the random distances, None derives them from the seed of the run without drawing from its rng.
+    instance_file = None #TSPLIB .tsp file or csv file of x,y coordinates the cities are loaded from, None draws random distances.
+    edge_weight_type = None #"EUC_2D", "GEO" or "EXPLICIT" for TSPLIB files, "EUC" (unrounded euclidean) for csv files.
+    coordinates = None #(n, 2) coordinates of the cities of a loaded instance.
+    geo_pi = 3.141592 #value of PI the TSPLIB GEO distances are defined with, np.pi moves some of them by 1.
+    geo_radians = None #(latitude, longitude) of the cities of a GEO instance in radians, computed on first use.
+    explicit_weights = None #n x n weights of an EXPLICIT instance, only kept until the distances are built.
+    distance_cache_size = 1 << 16 #distances remembered by the lazy storage for the scalar lookups of the local search.
+    distance_cache = None
+    crossover_method = "ox" #key into crossover_operators.
+    crossover_operators = {
+        "single_point": "single_point_crossover",
+        "ox": "order_crossover",
+        "pmx": "partially_mapped_crossover",
+        "eax": "edge_assembly_crossover",
+    } #crossover name -> method taking two (pairs, n) parent matrices and returning the children matrix.
+    selection_method = "tournament" #key into selection_operators.
+    selection_operators = {
+        "roulette_cutoff": "cutoff_selection",
+        "sus": "stochastic_universal_sampling",
+        "tournament": "tournament_selection",
+        "rank": "rank_selection",
+    } #selection name -> method taking (lengths, fitness, count) and returning the indices of the mating pool.
+    tournament_size = 3
+    elitism = 0.05 #share of the shortest routes copied unchanged into the next generation.
+    mutation_method = "swap" #key into mutation_operators.
+    mutation_operators = {
+        "swap": "swap_mutation",
+        "two_opt": "two_opt_mutation",
+        "or_opt": "or_opt_mutation",
+    } #mutation name -> method mutating a (rows, n) matrix in place and returning the tour length delta of every row.
+    local_search = False #runs the 2-opt / Or-opt stage over the children after mutation.
+    neighbor_count = 8 #size of the nearest neighbour candidate list of every city.
+    local_search_moves = 10000 #improving moves allowed per generation, None for no limit.
+    local_search_time = None #seconds allowed per generation, None for no limit.
+    neighbors = None
+    neighbor_gaps = None
+    workers = 1 #number of processes scoring the population, 1 scores it in this process.
+    chunk_size = 2048 #rows of the population matrix sent to a worker per task.
+    pool = None
+    shared_distances = None
+    islands = 1 #number of island processes, 1 evolves a single population.
+    migration_interval = 10 #generations between two migrations.
+    migrants = 2 #best routes sent to another island at every migration.
+    migration_topology = "ring" #"ring" sends to the next island, "random" to a random permutation of the islands.
+    migration_seed = None
+    island_generations = None
+    island_poll = 1.0 #seconds between two checks that the island processes are still alive while waiting for their results.
+    child_lengths = None
+    seeding = "random" #key into seeding_operators.
+    seeding_operators = {
+        "random": "random_tours",
+        "nearest_neighbor": "nearest_neighbor_tours",
+        "greedy": "greedy_edge_tours",
+        "space_filling_curve": "space_filling_curve_tours",
+    } #seeding name -> method taking a count and returning a (count, n) matrix of tours.
+    seeding_share = 0.1 #share of the initial population built by the seeding construction, the rest is shuffled.
+    mutation_rate = 2 #percentage of children mutated every generation.
+    plot = True #shows the plots once the run is over, matplotlib is only imported when this is set.
+    live_plot = False #draws the run while it evolves from a separate process, instead of the plots at the end.
+    plot_fps = 2.0 #maximum redraws per second of the live plot, and stats batches sent to it.
+    plot_points = 2000 #generations kept by the live plot and drawn by the progress plots, the history is decimated beyond.
+    plot_path_lines = 10 #improving best paths drawn by plot_best_path_evolution.
+    plot_queue = None
+    plot_process = None
+    plot_rows = None #stats rows not sent to the live plot yet, None once the live plot is stopped.
+    next_plot = 0.0
+    plotted_distance = np.inf #best distance of the last path sent to the live plot.
+    verbosity = "info" #key into verbosity_levels.
+    verbosity_levels = {"quiet": logging.ERROR, "info": logging.INFO, "debug": logging.DEBUG}
+    message_levels = {
+        "[ERR]": logging.ERROR,
+        "[BREAK]": logging.WARNING,
+        "[INFO]": logging.INFO,
+        "[PROGRESS]": logging.INFO,
+        "[PROCESS]": logging.DEBUG,
+    } #tag at the start of a status message -> level it is logged at.
+    progress_interval = 1.0 #seconds between two progress lines.
+    next_progress = 0.0
+    generation = 0 #generations evolved so far by the array mode.
+    initial_rng_state = None #state of rng at the start of the run, the random distances derive from it so a checkpoint can rebuild them.
+    checkpoint_file = None #.npz file the array mode run is checkpointed into.
+    checkpoint_interval = 50 #generations between two checkpoints.
+    stats_capacity = 10000 #generations kept in memory by the stats history.
+    stats_file = None #csv file every generation's stats are appended to.
+    diversity_sample = 256 #routes compared against the best one to measure the diversity of the population.
+    fitness_cache_bytes = 0 #byte budget of the cache of tour lengths, 0 scores every tour.
+    fitness_cache = None
+    canonical_scoring = False #sums every tour from its canonical orientation, on along with the fitness cache so its hits equal fresh scores.
+    profiling = False #times every stage and counts evaluations, children and mutations into metrics.
+    metrics = None
+    metrics_port = None #port of the local http endpoint serving the metrics, None for no endpoint.
+    metrics_host = "127.0.0.1"
+    metrics_server = None
+    generation_callbacks = () #callback(tsp, stats) called after every generation of run, a truthy return stops the run.
+    settings_fields = (
+        "population_mode", "distance_dtype", "distance_storage", "distance_file", "distance_seed", "instance_file", "distance_cache_size",
+        "seeding", "seeding_share", "crossover_method", "selection_method", "tournament_size", "elitism", "mutation_method",
+        "local_search", "neighbor_count", "local_search_moves", "local_search_time",
+        "workers", "chunk_size", "gather_budget", "checkpoint_file", "checkpoint_interval",
+        "stats_capacity", "stats_file", "diversity_sample", "profiling", "metrics_port", "metrics_host", "fitness_cache_bytes",
+        "live_plot", "plot_fps", "plot_points",
+    ) #options that define a run, saved along with a checkpoint.
+
+    def __init__(self, n_cities = None, population_size = None, iterations = None, mutation_rate = 2, seed = None, plot = None, **options) -> None:
         """
         This constructor, initializes all the fields required for this solution. 
+        n_cities, population_size and iterations that are not given are asked for through input().
+        When instance_file is given the cities are loaded from it and n_cities is ignored.
+        When all three are given the run is headless and does not plot unless plot is set.
+        Any other class field, e.g. crossover_method or workers, can be overridden through options, anything else raises a TypeError.
         """
+        self.check_options(options)
         try:
-            self.number_of_cities = int(input("[I/O] Enter the total number of cities: ")) #accepts the user input to total number of cities.
-            self.status_update("[PROCESS] Initializing random distances to each cities!")
-            self.distances = self.get_distance_matrix(self.number_of_cities) #generate random distances between cities.
-            self.population_size = int(input("[I/O] Please enter population size: "))
-            self.generations = list() #the output of each generation must be stored within this. e
-            self.iterations = int(input("[I/O] Please enter the number of iterations you want: "))
+            headless = None not in (population_size, iterations) and (n_cities is not None or options.get("instance_file") is not None)
+            self.plot = (not headless) if plot is None else plot
+            self.mutation_rate = mutation_rate
+            for field, value in options.items():
+                setattr(self, field, value)
+            logger.setLevel(self.verbosity_levels[self.verbosity])
+            if seed is not None:
+                random.seed(seed)
+            self.rng = np.random.default_rng(seed)
+            if self.initial_rng_state is not None:
+                self.rng.bit_generator.state = self.initial_rng_state
+            self.initial_rng_state = copy.deepcopy(self.rng.bit_generator.state)
+
+            if self.instance_file is not None:
+                n_cities = self.load_instance(self.instance_file)
+            elif n_cities is None:
+                n_cities = int(input("[I/O] Enter the total number of cities: ")) #accepts the user input to total number of cities.
+            self.number_of_cities = n_cities
+            self.status_update("[PROCESS] Initializing distances to each cities!")
+            self.distances = self.get_distance_matrix(self.number_of_cities) #generate random distances between cities, or build them from the instance.
+            self.explicit_weights = None
+            if self.seeding == "space_filling_curve" and self.coordinates is None:
+                self.status_update("[INFO] The space_filling_curve seeding needs an instance with coordinates, seeding with nearest_neighbor instead.")
+                self.seeding = "nearest_neighbor"
+            if population_size is None:
+                population_size = int(input("[I/O] Please enter population size: "))
+            self.population_size = population_size
+            self.generations = StatsHistory(self.stats_capacity, self.stats_file) #the output of each generation must be stored within this.
+            if self.profiling or self.metrics_port is not None:
+                self.metrics = RunMetrics()
+            if self.fitness_cache_bytes:
+                self.fitness_cache = TourCache(self.fitness_cache_bytes)
+                self.canonical_scoring = True
+            self.generation_callbacks = list(self.generation_callbacks)
+            if iterations is None:
+                iterations = int(input("[I/O] Please enter the number of iterations you want: "))
+            self.iterations = iterations
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to intialize module params: "+str(e))
         
 
-    def status_update(self, msg) -> None:
+    @classmethod
+    def check_options(cls, options) -> None:
         """
-        This method, accepts a string from other methods to give a update of current process to user.
+        This method raises a TypeError for every name of options that is not a field of the class, methods included.
+        """
+        for field in options:
+            if field.startswith("_") or not hasattr(cls, field) or inspect.isroutine(getattr(cls, field)):
+                raise TypeError("unknown option %s"%(field))
+
+    def stage(self, name):
+        """
+        This method returns the context timing the named stage, a shared no-op one when profiling is off so the stages cost nothing.
+        """
+        return no_stage if self.metrics is None else self.metrics.stage(name)
+
+    def count(self, name, k = 1) -> None:
+        if self.metrics is not None:
+            self.metrics.count(name, k)
+
+    def add_metrics_callback(self, callback) -> None:
+        """
+        This method turns profiling on and registers callback, called with a snapshot dict of the metrics after every generation:
+        generation, elapsed, generations_per_second, best_distance, average_distance, diversity, stages and counters.
         """
-        print(msg)
+        self.profiling = True
+        if self.metrics is None:
+            self.metrics = RunMetrics()
+        self.metrics.callbacks.append(callback)
 
+    def publish_metrics(self, stats) -> None:
+        if self.metrics is not None:
+            self.metrics.publish(self.generation if self.population_mode == "array" else self.generations.count, stats)
 
-    def get_distance_matrix(self, n) -> list:
+    def start_metrics_server(self) -> None:
         """
-        This method generates a distance matrix for n cities.
+        This method serves the metrics on metrics_host:metrics_port from a daemon thread, see MetricsHandler.
         """
         try:
-            matrix = list()
-            self.status_update("[PROCESS] Initializing distances between %d cities"%(n))
-            for i in range(n):
-                row = list()
-                for j in range(n):
-                    if i == j :
-                        row.append(0) #distance from a city to itself is zero!
-                        continue
+            self.metrics_server = http.server.ThreadingHTTPServer((self.metrics_host, self.metrics_port), MetricsHandler)
+            self.metrics_server.metrics = self.metrics
+            threading.Thread(target=self.metrics_server.serve_forever, daemon=True).start()
+            self.status_update("[INFO] Serving metrics on http://%s:%d/metrics"%(self.metrics_host, self.metrics_server.server_address[1]))
+        except Exception as e:
+            self.metrics_server = None
+            self.status_update("[ERR] The following error occured while trying to start the metrics endpoint: "+str(e))
+
+    def stop_metrics_server(self) -> None:
+        if self.metrics_server is not None:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+            self.metrics_server = None
+
+    def status_update(self, msg) -> None:
+        """
+        This method, accepts a string from other methods to give a update of current process to user.
+        The message is logged at the level of its tag, so anything below the verbosity of the run costs a single level check.
+        """
+        level = self.message_levels.get(msg[:msg.find("]") + 1], logging.INFO)
+        if logger.isEnabledFor(level):
+            logger.log(level, msg)
+
+    def report_progress(self, msg, force = False) -> None:
+        """
+        This method logs a progress line, at most one every progress_interval seconds unless forced.
+        """
+        now = time.perf_counter()
+        if force or now >= self.next_progress:
+            self.next_progress = now + self.progress_interval
+            self.status_update("[PROGRESS] " + msg)
 
-                    row.append(round(random.uniform(1, n), 4)) #append the distance between two cities.
-                matrix.append(row)
 
+    def load_instance(self, path) -> int:
+        """
+        This method loads the cities of a TSPLIB file, with EUC_2D, GEO or EXPLICIT edge weights, or of a csv file of coordinates,
+        and returns the number of cities. Files ending in .csv are read as csv, anything else as TSPLIB.
+        The csv rows are either x,y or id,x,y, a header line is skipped, and their distances are not rounded.
+        """
+        self.status_update("[PROCESS] Loading cities from %s"%(path))
+        if path.lower().endswith(".csv"):
+            with open(path) as handle:
+                first = handle.readline().split(",")
+            try:
+                [float(value) for value in first]
+                header = 0
+            except ValueError:
+                header = 1
+            self.coordinates = np.loadtxt(path, delimiter=",", skiprows=header, usecols=(len(first) - 2, len(first) - 1), ndmin=2)
+            self.edge_weight_type = "EUC"
+            return len(self.coordinates)
+
+        specification, sections, section = dict(), dict(), None
+        with open(path) as handle:
+            for line in handle:
+                line = line.strip()
+                if line == "EOF":
+                    break
+                key, colon, value = line.partition(":")
+                if colon and key.strip().replace("_", "").isalpha():
+                    specification[key.strip().upper()] = value.strip()
+                elif line.upper().endswith("_SECTION"):
+                    section = line.upper()
+                    sections[section] = list()
+                elif line and section is not None:
+                    sections[section].extend(line.split())
+
+        if specification.get("TYPE", "TSP").split()[0] != "TSP":
+            raise ValueError("only symmetric TSP instances are supported, %s is %s"%(path, specification["TYPE"]))
+        n = int(specification["DIMENSION"])
+        self.edge_weight_type = specification.get("EDGE_WEIGHT_TYPE")
+        if self.edge_weight_type not in ("EUC_2D", "GEO", "EXPLICIT"):
+            raise ValueError("unsupported EDGE_WEIGHT_TYPE %s"%(self.edge_weight_type))
+        coordinates = sections.get("NODE_COORD_SECTION", sections.get("DISPLAY_DATA_SECTION"))
+        if coordinates:
+            nodes = np.array(coordinates, dtype=np.float64).reshape(n, 3)
+            self.coordinates = nodes[np.argsort(nodes[:, 0], kind="stable"), 1:]
+            self.geo_radians = None
+        if self.edge_weight_type != "EXPLICIT":
+            return n
+
+        weights = np.array(sections["EDGE_WEIGHT_SECTION"], dtype=np.float64)
+        layout = specification.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX")
+        triangles = {
+            "UPPER_ROW": lambda: np.triu_indices(n, 1), "LOWER_COL": lambda: np.triu_indices(n, 1),
+            "LOWER_ROW": lambda: np.tril_indices(n, -1), "UPPER_COL": lambda: np.tril_indices(n, -1),
+            "UPPER_DIAG_ROW": lambda: np.triu_indices(n), "LOWER_DIAG_COL": lambda: np.triu_indices(n),
+            "LOWER_DIAG_ROW": lambda: np.tril_indices(n), "UPPER_DIAG_COL": lambda: np.tril_indices(n),
+        } #weights layout -> cells of the matrix it lists in order.
+        if layout == "FULL_MATRIX":
+            matrix = weights[:n * n].reshape(n, n)
+        elif layout in triangles:
+            matrix = np.zeros((n, n))
+            cells = triangles[layout]()
+            matrix[cells] = weights[:len(cells[0])]
+            matrix = matrix + matrix.T
+        else:
+            raise ValueError("unsupported EDGE_WEIGHT_FORMAT %s"%(layout))
+        np.fill_diagonal(matrix, 0)
+        self.explicit_weights = matrix
+        return n
+
+    def get_distance_matrix(self, n) -> np.ndarray:
+        """
+        This method generates a symmetric random distance matrix for n cities, or builds it from the loaded instance.
+        Only the upper triangle is drawn, block by block in the condensed layout, and then mirrored,
+        so no value is generated twice and no n x n temporary is created.
+        Random distances are drawn from distance_rng, so the rng of the run gives the same populations whether they are drawn or reused.
+        When distance_file is set the matrix lives in a .npy memmap, an existing file is reused as is when the fingerprint
+        written next to it matches distance_fingerprint.
+        The lazy storage keeps no matrix at all and returns None, edge_lengths then works from the coordinates.
+        """
+        try:
+            if self.distance_storage == "lazy":
+                if self.coordinates is None or self.edge_weight_type == "EXPLICIT":
+                    raise ValueError("lazy distances need an instance with coordinates")
+                self.status_update("[PROCESS] Computing distances between %d cities on demand."%(n))
+                return None
+            condensed = self.distance_storage == "condensed"
+            shape = (n * (n - 1) // 2,) if condensed else (n, n)
+            dtype = np.dtype(self.distance_dtype)
+
+            rng = self.distance_rng() if self.edge_weight_type is None else None
+            fingerprint = self.distance_fingerprint(n, rng)
+            sidecar = None if self.distance_file is None else self.distance_file + ".json"
+
+            if self.distance_file is not None and os.path.exists(self.distance_file):
+                saved = None
+                if os.path.exists(sidecar):
+                    with open(sidecar) as handle:
+                        saved = json.load(handle)
+                matrix = np.lib.format.open_memmap(self.distance_file, mode="r")
+                if saved == fingerprint and matrix.shape == shape and matrix.dtype == dtype:
+                    self.status_update("[PROCESS] Reusing distances between %d cities from %s"%(n, self.distance_file))
+                    return matrix
+                del matrix
+                self.status_update("[INFO] %s does not match the requested distances, regenerating it."%(self.distance_file))
 
-            for i in range(len(matrix)):
-                for j in range(len(matrix[i])):
-                    matrix[j][i] = matrix[i][j]
+            self.status_update("[PROCESS] Initializing distances between %d cities"%(n))
+            if self.distance_file is not None:
+                if os.path.exists(sidecar):
+                    os.remove(sidecar) #a half written file must not be reused.
+                matrix = np.lib.format.open_memmap(self.distance_file, mode="w+", dtype=dtype, shape=shape)
+            else:
+                matrix = np.empty(shape, dtype=dtype)
+
+            offset = lambda i: i * n - i * (i + 1) // 2 #position of row i of the upper triangle in the condensed layout.
+            rows = max(1, self.gather_budget // max(1, n))
+            for a in range(0, n, rows):
+                b = min(n, a + rows)
+                if self.edge_weight_type is None:
+                    values = np.round(rng.uniform(1, n, size=offset(b) - offset(a)), 4) #upper triangle of rows a..b in one draw.
+                else:
+                    values = self.instance_distances(a, b)
+                if condensed:
+                    matrix[offset(a):offset(b)] = values
+                    continue
 
+                start = 0
+                for i in range(a, b):
+                    matrix[i, i] = 0 #distance from a city to itself is zero!
+                    matrix[i, i + 1:] = values[start:start + n - 1 - i]
+                    start = start + n - 1 - i
+                matrix[a:b, :a] = matrix[:a, a:b].T #mirror the columns already drawn by the rows above.
+                for i in range(a + 1, b):
+                    matrix[i, a:i] = matrix[a:i, i]
+
+            if isinstance(matrix, np.memmap):
+                matrix.flush()
+                with open(sidecar, "w") as handle:
+                    json.dump(fingerprint, handle)
             self.status_update("[PROCESS] Successfully intialized distances between %d cities."%(n))
-            return matrix  
+            return matrix
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to create a distance matrix"+str(e))
 
+    def distance_rng(self) -> np.random.Generator:
+        """
+        This method returns the generator the random distances are drawn from, seeded by distance_seed or else
+        a jump ahead of the initial state of rng, a stream of its own that never overlaps the draws of the run.
+        """
+        if self.distance_seed is not None:
+            return np.random.default_rng(self.distance_seed)
+        bit_generator = np.random.PCG64()
+        bit_generator.state = self.initial_rng_state
+        return np.random.Generator(bit_generator.jumped())
+
+    def distance_fingerprint(self, n, rng = None) -> dict:
+        """
+        This method describes the distances get_distance_matrix builds, the state of the rng they are drawn from
+        or the sha256 of the instance file they are computed from, along with their size and layout.
+        """
+        fingerprint = {"cities": n, "storage": self.distance_storage, "dtype": np.dtype(self.distance_dtype).name}
+        if rng is not None:
+            fingerprint["rng_state"] = rng.bit_generator.state
+        else:
+            with open(self.instance_file, "rb") as handle:
+                fingerprint["instance_sha256"] = hashlib.sha256(handle.read()).hexdigest()
+        return json.loads(json.dumps(fingerprint)) #as read back from the json file.
+
+    def instance_distances(self, a, b) -> np.ndarray:
+        """
+        This method returns the upper triangle of rows a..b of the distances of the loaded instance, in the condensed order.
+        """
+        n = self.number_of_cities
+        rows = np.arange(a, b)
+        counts = n - 1 - rows
+        i = np.repeat(rows, counts)
+        j = np.arange(len(i)) - np.repeat(np.cumsum(counts) - counts, counts) + i + 1
+        if self.edge_weight_type == "EXPLICIT":
+            return self.explicit_weights[i, j]
+        return self.coordinate_lengths(i, j)
+
+    def coordinate_lengths(self, a, b) -> np.ndarray:
+        """
+        This method computes the distances between the cities in a and b element wise from their coordinates,
+        rounded the way TSPLIB defines edge_weight_type.
+        """
+        a = np.asarray(a)
+        b = np.asarray(b)
+        x, y = self.coordinates[:, 0], self.coordinates[:, 1]
+        if self.edge_weight_type == "GEO":
+            if self.geo_radians is None:
+                degrees = np.trunc(self.coordinates)
+                self.geo_radians = (self.geo_pi * (degrees + 5.0 * (self.coordinates - degrees) / 3.0) / 180.0).T #ddd.mm to radians.
+            latitude, longitude = self.geo_radians
+            q1 = np.cos(longitude[a] - longitude[b])
+            q2 = np.cos(latitude[a] - latitude[b])
+            q3 = np.cos(latitude[a] + latitude[b])
+            lengths = np.floor(6378.388 * np.arccos(np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1, 1)) + 1.0)
+            return np.where(a == b, 0.0, lengths)
+        lengths = np.hypot(x[a] - x[b], y[a] - y[b])
+        return np.floor(lengths + 0.5) if self.edge_weight_type == "EUC_2D" else lengths
+
+    def edge_lengths(self, a, b) -> np.ndarray:
+        """
+        This method looks up the distances between the cities in a and b element wise, for any storage layout.
+        """
+        if self.distance_storage == "lazy":
+            return self.coordinate_lengths(a, b)
+        if self.distance_storage != "condensed":
+            return self.distances[a, b]
+        n = self.number_of_cities
+        a = np.asarray(a, dtype=np.int64)
+        b = np.asarray(b, dtype=np.int64)
+        if n < 2:
+            return np.zeros(np.broadcast(a, b).shape, dtype=self.distances.dtype)
+        i = np.minimum(a, b)
+        j = np.maximum(a, b)
+        index = i * n - i * (i + 1) // 2 + (j - i - 1)
+        return np.where(i == j, 0, self.distances[np.where(i == j, 0, index)])
+
+    def edge_length(self, a, b) -> float:
+        """
+        Scalar counterpart of edge_lengths, for the python level loops of the local search.
+        The lazy storage keeps the last distance_cache_size distances it computed in an LRU cache.
+        """
+        if self.distance_storage == "lazy":
+            if self.distance_cache is None:
+                self.distance_cache = functools.lru_cache(maxsize=self.distance_cache_size)(lambda i, j: float(self.coordinate_lengths(i, j)))
+            return self.distance_cache(a, b) if a < b else self.distance_cache(b, a)
+        if self.distance_storage != "condensed":
+            return self.distances[a, b]
+        if a == b:
+            return 0.0
+        i, j = (a, b) if a < b else (b, a)
+        return self.distances[i * self.number_of_cities - i * (i + 1) // 2 + (j - i - 1)]
+
 
     def get_population_string(self) -> list:
         """
         This method creates a instance for the population and returns it to the calling method.
         """
         try:
-            string = list()
-
-            while len(string) != self.number_of_cities:
-                value = random.randint(0, (self.number_of_cities - 1))
-                if value not in string:
-                    string.append(value)
-                else:
-                    continue
-
+            string = list(range(self.number_of_cities))
+            random.shuffle(string)
             return string
         except Exception as e:
             pass
@@ -89,14 +1005,17 @@ class TSP():
         """
         This method, accepts size of total population to be created,
         then creates each instance of population using "get_population_string" and returns the entire population created.
+        The first seeding_share of the population is built by the seeding construction unless seeding is "random".
         """
         try:
             pop = list()
             self.status_update("[PROCESS] Creating population with size %d"%(n))
-            for i in range(n):
+            if self.seeding != "random":
+                pop = self.seed_tours(int(round(self.seeding_share * n))).tolist()
+            for i in range(len(pop), n):
                 new_sample = self.get_population_string()
                 pop.append(new_sample)
-                print(f"\r[PROCESS] Total population created so far:  {round(((i/n)*100),2)}% DONE", end="")
+                self.report_progress("Total population created so far: %.2f%% DONE"%((i/n)*100))
     
             self.status_update("[PROCESS] A new population with size %d has been created successfully!"%(n))
             return pop
@@ -109,14 +1028,14 @@ class TSP():
         This accepts a instance from population and then computes the total distance traveled.
         """
         try:
-            distance = 0
-            for i in range(len(instance) -1):
-                j = i + 1
-                distance = distance + self.distances[instance[i]][instance[j]]
-
-            distance = distance + self.distances[instance[-1]][instance[0]]
-
-            return round(distance,4)
+            instance = np.asarray(instance)[None, :]
+            with self.stage("evaluation"):
+                if self.fitness_cache is not None:
+                    distance = self.cached_lengths(instance, self.score_population)[0]
+                else:
+                    self.count("evaluations")
+                    distance = self.compute_population_lengths(instance)[0]
+                return round(float(distance),4)
 
         except Exception as e:
             self.status_update("[ERR] The following error occured while compute the distance for each sample: "+str(e))
@@ -138,6 +1057,199 @@ class TSP():
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to compute distances for population samples: "+str(e))
 
+    def create_population_matrix(self, n) -> np.ndarray:
+        """
+        This method creates the entire population as a (n, number_of_cities) int32 matrix,
+        where every row is an independent random permutation of the cities.
+        The first seeding_share of the rows are built by the seeding construction unless seeding is "random".
+        """
+        try:
+            self.status_update("[PROCESS] Creating population matrix with size %d"%(n))
+            pop = self.random_tours(n)
+            if self.seeding != "random":
+                seeded = self.seed_tours(int(round(self.seeding_share * n)))
+                pop[:len(seeded)] = seeded
+            self.status_update("[PROCESS] A new population with size %d has been created successfully!"%(n))
+            return pop
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to create population matrix: "+str(e))
+
+    def seed_tours(self, count) -> np.ndarray:
+        """
+        This method builds count tours with the seeding construction.
+        """
+        self.status_update("[PROCESS] Seeding %d tours with the %s construction."%(count, self.seeding))
+        if count <= 0:
+            return np.empty((0, self.number_of_cities), dtype=np.int32)
+        return getattr(self, self.seeding_operators[self.seeding])(count).astype(np.int32)
+
+    def random_tours(self, count) -> np.ndarray:
+        cities = np.arange(self.number_of_cities, dtype=np.int32)
+        return self.rng.permuted(np.broadcast_to(cities, (count, self.number_of_cities)), axis=1)
+
+    def planar(self) -> bool:
+        """
+        This method tells whether the distances are plane euclidean ones, which the grid index answers nearest neighbour queries for.
+        """
+        return self.coordinates is not None and self.edge_weight_type in ("EUC_2D", "EUC")
+
+    def perturbed_tours(self, tour: np.ndarray, count) -> np.ndarray:
+        """
+        This method returns tour followed by count - 1 copies of it, each reconnected by a random double bridge move,
+        so the seeded tours of a deterministic construction are not all the same.
+        """
+        tours = np.tile(tour, (count, 1))
+        n = len(tour)
+        if n < 8:
+            return tours
+        for row in tours[1:]:
+            a, b, c = np.sort(self.rng.choice(np.arange(1, n), size=3, replace=False))
+            row[:] = np.concatenate((row[:a], row[b:c], row[a:b], row[c:]))
+        return tours
+
+    def nearest_neighbor_tours(self, count) -> np.ndarray:
+        """
+        This method builds count nearest neighbour tours from distinct random start cities.
+        The next city is the first unvisited one of the neighbour list of the current city,
+        only when the whole list is visited the closest unvisited city is looked up in the grid index, or scanned for without coordinates.
+        """
+        n = self.number_of_cities
+        if self.neighbors is None:
+            self.build_neighbor_lists(self.neighbor_count)
+        starts = self.rng.choice(n, size=count, replace=count > n)
+        tours = np.empty((count, n), dtype=np.int32)
+        for row, start in enumerate(starts.tolist()):
+            grid = CityGrid(self.coordinates) if self.planar() else None
+            visited = bytearray(n)
+            city = start
+            tour = [city]
+            for _ in range(n - 1):
+                visited[city] = 1
+                if grid is not None:
+                    grid.remove(city)
+                following = -1
+                for other in self.neighbors[city]:
+                    if not visited[other]:
+                        following = other
+                        break
+                if following < 0 and grid is not None:
+                    following = grid.nearest(city)
+                elif following < 0:
+                    left = np.flatnonzero(np.frombuffer(visited, dtype=np.uint8) == 0)
+                    following = int(left[np.argmin(self.edge_lengths(city, left))])
+                tour.append(following)
+                city = following
+            tours[row] = tour
+        return tours
+
+    def greedy_edge_tours(self, count) -> np.ndarray:
+        """
+        This method builds the greedy edge tour and returns it with count - 1 perturbed copies.
+        The candidate edges of the neighbour lists are added shortest first whenever both cities still have a free end and no cycle is closed,
+        the resulting fragments are then chained end to the closest free end of another fragment.
+        """
+        n = self.number_of_cities
+        if self.neighbors is None:
+            self.build_neighbor_lists(self.neighbor_count)
+        first = np.repeat(np.arange(n), [len(row) for row in self.neighbors])
+        second = np.fromiter((city for row in self.neighbors for city in row), dtype=np.int64, count=len(first))
+        gaps = np.fromiter((gap for row in self.neighbor_gaps for gap in row), dtype=np.float64, count=len(first))
+        pairs, index = np.unique(np.stack([np.minimum(first, second), np.maximum(first, second)], axis=1), axis=0, return_index=True) #every edge once, whichever list it came from.
+        low, high, gaps = pairs[:, 0], pairs[:, 1], gaps[index]
+        order = np.lexsort((high, low, gaps))
+        parent = list(range(n))
+        def find(city):
+            while parent[city] != city:
+                parent[city] = parent[parent[city]]
+                city = parent[city]
+            return city
+        adjacency = [[] for _ in range(n)]
+        for a, b in zip(low[order].tolist(), high[order].tolist()):
+            if len(adjacency[a]) < 2 and len(adjacency[b]) < 2 and find(a) != find(b):
+                parent[find(a)] = find(b)
+                adjacency[a].append(b)
+                adjacency[b].append(a)
+
+        ends = [city for city in range(n) if len(adjacency[city]) < 2]
+        grid = CityGrid(self.coordinates, ends) if self.planar() else None
+        free = np.zeros(n, dtype=bool)
+        free[ends] = True
+        tour = list()
+        city = ends[0]
+        while city >= 0:
+            previous = -1
+            while True: #walk the fragment from city to its other end.
+                tour.append(city)
+                free[city] = False
+                if grid is not None and len(adjacency[city]) < 2:
+                    grid.remove(city)
+                following = [other for other in adjacency[city] if other != previous]
+                if not following or len(tour) == n:
+                    break
+                previous, city = city, following[0]
+            if grid is not None:
+                city = grid.nearest(city)
+            else:
+                left = np.flatnonzero(free)
+                city = int(left[np.argmin(self.edge_lengths(city, left))]) if len(left) else -1
+        return self.perturbed_tours(np.array(tour), count)
+
+    def space_filling_curve_tours(self, count) -> np.ndarray:
+        """
+        This method orders the cities along a Hilbert curve over their coordinates, and returns that tour with count - 1 perturbed copies.
+        """
+        if self.coordinates is None:
+            raise ValueError("space filling curve seeding needs an instance with coordinates")
+        bits = 16
+        low = self.coordinates.min(axis=0)
+        span = max(float((self.coordinates.max(axis=0) - low).max()), 1e-12)
+        x, y = ((self.coordinates - low) / span * ((1 << bits) - 1)).astype(np.int64).T
+        index = np.zeros(len(x), dtype=np.int64)
+        side = 1 << bits
+        s = side >> 1
+        while s > 0: #xy to the distance along the curve, one quadrant level per step.
+            rx = (x & s) > 0
+            ry = (y & s) > 0
+            index += s * s * ((3 * rx) ^ ry)
+            flip = ~ry
+            x, y = np.where(flip & rx, side - 1 - x, x), np.where(flip & rx, side - 1 - y, y)
+            x, y = np.where(flip, y, x), np.where(flip, x, y)
+            s >>= 1
+        return self.perturbed_tours(np.argsort(index, kind="stable"), count)
+
+    def canonical_tours(self, population: np.ndarray) -> np.ndarray:
+        """
+        This method returns a copy of the population matrix with every tour rotated to start at its lowest city
+        and reversed when needed so its second city is lower than its last one.
+        """
+        m = population.shape[1]
+        tours = np.take_along_axis(population, (population.argmin(axis=1)[:, None] + np.arange(m)) % m, axis=1)
+        if m > 2:
+            flip = tours[:, 1] > tours[:, -1]
+            tours[flip, 1:] = tours[flip, :0:-1]
+        return tours
+
+    def compute_population_lengths(self, population: np.ndarray) -> np.ndarray:
+        """
+        This method computes the tour length of every row of a population matrix.
+        Each block of rows is scored with one gather over the distance matrix, (city, next city) for every position,
+        the block size is bounded by gather_budget so huge populations do not allocate a huge temporary.
+        With canonical_scoring every tour is summed from its canonical orientation, starting at its lowest city towards the lower of its two neighbours,
+        so all the rotations and the reversal of a tour score the exact same float and a fitness cache hit equals a fresh score.
+        """
+        try:
+            n, m = population.shape
+            lengths = np.empty(n, dtype=np.float64)
+            rows = max(1, self.gather_budget // max(1, m))
+            for start in range(0, n, rows):
+                block = population[start:start + rows]
+                if self.canonical_scoring:
+                    block = self.canonical_tours(block)
+                lengths[start:start + rows] = self.edge_lengths(block, np.roll(block, -1, axis=1)).sum(axis=1, dtype=np.float64)
+            return lengths
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to compute lengths for the population matrix: "+str(e))
+
 
     def fitness(self, population) -> dict:
         """
@@ -157,7 +1269,7 @@ class TSP():
             for route, distance in population.items():
                 population_fitnesss[route] = 1 - (distance/total_distance) #gives us invert fitness values!
 
-            self.status_update("[INFO] Fitness values have been created successfully for population samples!")
+            self.status_update("[PROCESS] Fitness values have been created successfully for population samples!")
             return population_fitnesss
 
         except Exception as e:
@@ -165,19 +1277,20 @@ class TSP():
 
     def roulette_wheel(self) -> dict():
         """
-        Roulette wheel generates a random point between 0.0, 1.0 and then selects those routes/population instances with fitness value greater than the generated value.
+        Selects the fit routes/population instances of the population with the selection_method operator.
+        A route drawn more than once is kept once, as routes are the keys of the population dicts.
         """
         try:
             self.status_update("[PROCESS] Spinning roulette wheel on population instances.")
-            self.status_update("[PROCESS] Determining random fitness cutoff for population.")
+            routes = list(self.population_fitness.keys())
+            fitness = np.array(list(self.population_fitness.values()))
+            lengths = np.array([self.population_distance[route] for route in routes])
+            chosen = getattr(self, self.selection_operators[self.selection_method])(lengths, fitness, len(routes))
 
-            cut_off = random.uniform(0.000, max(self.population_fitness.values()))
             selected_population = dict()
-
-            for route, fitness_level in self.population_fitness.items():
-                if fitness_level>=cut_off:
-                    selected_population[route] = fitness_level
-            self.status_update("[INFO] Population has been narrowed down to fit population.")
+            for k in chosen.tolist():
+                selected_population[routes[k]] = fitness[k]
+            self.status_update("[PROCESS] Population has been narrowed down to fit population.")
             return selected_population
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to spin roulette wheel over routes: "+str(e))
@@ -185,7 +1298,7 @@ class TSP():
     def crossover(self, parent_one, parent_two) -> str:
         """
         The crossover method, accepts two parent strings from the population set,
-        Then creates a new child instance(route) by combining the information from two parents.
+        Then creates a new child instance(route) by combining the information from two parents, using the crossover_method operator.
         This resulting child is then returned as the next gen, instance of the population.
         """
         try:
@@ -196,10 +1309,9 @@ class TSP():
             if len(parent_one) != len(parent_two): #inorder to perform crossover we must have parents of same lenght
                 raise Exception("Parents are of not same size!")
 
-            random_index = random.randint(0, (len(parent_one)-1))
-
-            child = parent_one[:random_index] + parent_two[random_index:]
-            return child 
+            operator = getattr(self, self.crossover_operators[self.crossover_method])
+            child = operator(np.array([parent_one]), np.array([parent_two]))[0]
+            return child.tolist()
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to perform crossover for two routes/parents: "+str(e))
 
@@ -221,6 +1333,10 @@ class TSP():
                     continue
                 
                 child = self.crossover(parent_one= parents[i], parent_two= parents[j])
+                if child is None:
+                    self.count("invalid_children")
+                    continue
+                self.count("valid_children")
                 distance = self.compute_distance_of_sample(child)
                 join_and_convert = lambda lst: ','.join([str(i) for i in lst])
                 children[join_and_convert(child)] = distance
@@ -230,96 +1346,77 @@ class TSP():
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to apply crossover over selected population: "+str(e))
 
-    def mutate(self, child:str, mutation_rate = 2) -> list:
+    def mutate(self, child:str, mutation_rate = None) -> tuple:
         """
         The mutate method, is used mutuate a particular instance of a population.
-        By default the mutation rate is 2% to maintain diversity and keep the frequency in check.
+        By default the mutation rate is self.mutation_rate, 2% to maintain diversity and keep the frequency in check.
+        The mutation_method operator is used, returns the mutated route along with the change in its distance or None.
         """
         try:
             percentage = random.randint(1,100)
+            mutation_rate = self.mutation_rate if mutation_rate is None else mutation_rate
             
             split_and_convert = lambda lst: [int(s) for s in lst.split(',')]
             child = split_and_convert(child)
             if percentage>mutation_rate:
                 return None
-            else:
-                i = random.randint(0, (len(child)-1))
-                j = random.randint(0, (len(child)-1))
 
-                temp = child[j]
-                child[j] = child[i]
-                child[i] = temp
-
-            return child
+            child = np.array([child])
+            delta = getattr(self, self.mutation_operators[self.mutation_method])(child)
+            return child[0].tolist(), float(delta[0])
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to mutate a sample: "+str(e))
 
     def apply_mutation(self, population: dict) -> dict:
         """
         This method applies mutate method to the child population to randomly mutate certain routes.
+        The new distance is the old one plus the delta of the mutation, the route is never scored again.
         """
         try:
             mutated_samples = 0
             mutated_population = dict()
-            split_and_convert = lambda lst: [int(s) for s in lst.split(',')]
             join_and_convert = lambda lst: ','.join([str(i) for i in lst])
             self.status_update("[PROCESS] Trying to apply mutation over child population!")
-            self.status_update("[PROCESS] The mutation rate is 2%")
+            self.status_update("[PROCESS] The mutation rate is %s%%"%(self.mutation_rate))
             for route, distance in population.items(): 
                 result  = self.mutate(route) #try and mutate the sample.
                 if result is None:  #check if there is change in route from mutation
                     continue #no mutation occured we do nothing.
-                route =  split_and_convert(route)
+                result, delta = result
                
                 mutated_samples= mutated_samples + 1 #count mutated values
-                new_distance = self.compute_distance_of_sample(result) #compute distance for new route.
+                new_distance = round(distance + delta, 4) #only the edges touched by the mutation are looked up.
                 mutated_population[join_and_convert(result)] = new_distance #save the distance for new mutated route.
             self.status_update("[PROCESS] Out of %d from child population a total of %d have undergone mutation."%(len(population), mutated_samples))
+            self.count("mutations", mutated_samples)
 
             return mutated_population
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to mutate the population: "+str(e))
 
-    def get_population_results(self, population:dict, population_fitness: dict) -> list:
+    def get_population_results(self, population:dict, population_fitness: dict) -> dict:
         """
         This method accepts the child population and then computes the following statistics within the entire population:
         1. best route.
         2. best route fitness within it's population.
         3. average fitness of the population.
-        4. average distance of the population.
+        4. average distance of the population, and its standard deviation.
+        Distances and fitness values are reduced as arrays in a single pass each.
         """
         try:
             self.status_update("[PROCESS] Computing statistics for latest generation please wait.")
-            shortest_path = str()
-            shortest_distance = max(list(population.values()))
-            total_fitness = 0.0
-            average_fitness = 0.0
-            average_distance = 0.0
-            total_distance = 0.0
-            n = len(population)
-            self.status_update("[PROCESS] Computing best route.")
-            self.status_update("[PROCESS] Computing best distance.")
-            self.status_update("[PROCESS] Computing best Fitness.")
-            for route, distance in population.items():
-                total_distance = total_distance + distance
-                if shortest_distance>distance:
-                    shortest_path = route
-                    shortest_distance = distance
-                
-            for route, fitness in population_fitness.items():
-                total_fitness = total_fitness + fitness
-                
-            best_fitness = population_fitness[route]
-            average_distance = total_distance/n
-            average_fitness = total_fitness/n
+            routes = list(population.keys())
+            distances = np.fromiter(population.values(), dtype=np.float64, count=len(routes))
+            fitness = np.fromiter((population_fitness[route] for route in routes), dtype=np.float64, count=len(routes))
+            best = int(np.argmin(distances))
 
-            
             stats = {
-                "best_path": shortest_path,
-                "best_distance": shortest_distance,
-                "best_fitness": best_fitness,
-                "average_distance": average_distance,
-                "average_fitness": average_fitness
+                "best_path": routes[best],
+                "best_distance": float(distances[best]),
+                "best_fitness": float(fitness[best]),
+                "average_distance": float(distances.mean()),
+                "std_distance": float(distances.std()),
+                "average_fitness": float(fitness.mean())
             }
 
             self.status_update("[PROCESS] Stats for the latest generation are now ready.")        
@@ -327,20 +1424,678 @@ class TSP():
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to compute statistics of the population: "+str(e))
 
+    def start_workers(self) -> None:
+        """
+        This method starts the pool of evaluation workers.
+        The distance matrix is copied once into a shared memory block the workers attach to, or opened by them from distance_file,
+        so it is never pickled along with the tasks. Lazy distances only hand the coordinates to every worker once.
+        """
+        try:
+            self.status_update("[PROCESS] Starting %d evaluation workers."%(self.workers))
+            distance_file = self.distance_file if isinstance(self.distances, np.memmap) else None
+            shared_name = None
+            if distance_file is None and self.distances is not None:
+                self.shared_distances = shared_memory.SharedMemory(create=True, size=max(1, self.distances.nbytes))
+                shared = np.ndarray(self.distances.shape, dtype=self.distances.dtype, buffer=self.shared_distances.buf)
+                shared[...] = self.distances
+                shared_name = self.shared_distances.name
+            settings = {
+                "number_of_cities": self.number_of_cities,
+                "distance_storage": self.distance_storage,
+                "distance_shape": None if self.distances is None else self.distances.shape,
+                "distance_dtype": None if self.distances is None else self.distances.dtype,
+                "gather_budget": self.gather_budget,
+                "canonical_scoring": self.canonical_scoring,
+                "edge_weight_type": self.edge_weight_type,
+                "coordinates": self.coordinates if self.distances is None else None,
+            }
+            self.pool = multiprocessing.Pool(self.workers, initializer=attach_worker_distances, initargs=(settings, shared_name, distance_file))
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to start evaluation workers: "+str(e))
+
+    def stop_workers(self) -> None:
+        """
+        This method shuts the evaluation workers down and releases the shared distance matrix.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.shared_distances is not None:
+            self.shared_distances.close()
+            self.shared_distances.unlink()
+            self.shared_distances = None
+
+    def evaluate_population(self, population: np.ndarray) -> np.ndarray:
+        """
+        This method scores a population matrix, split in chunk_size row chunks over the worker pool when workers > 1.
+        With a fitness cache, only the distinct tours the cache does not know are scored.
+        """
+        try:
+            if self.fitness_cache is not None:
+                with self.stage("evaluation"):
+                    return self.cached_lengths(population, self.score_population)
+            return self.score_population(population)
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to evaluate the population matrix: "+str(e))
+
+    def score_population(self, population: np.ndarray) -> np.ndarray:
+        """
+        This method scores every row of a population matrix, in this process or over the worker pool.
+        """
+        try:
+            self.count("evaluations", len(population))
+            with self.stage("evaluation"):
+                if self.workers <= 1 or len(population) <= self.chunk_size:
+                    return self.compute_population_lengths(population)
+                if self.pool is None:
+                    self.start_workers()
+                chunks = [np.ascontiguousarray(population[k:k + self.chunk_size]) for k in range(0, len(population), self.chunk_size)]
+                return np.concatenate(self.pool.map(score_population_chunk, chunks))
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to evaluate the population matrix: "+str(e))
+
+    def tour_hashes(self, population: np.ndarray) -> np.ndarray:
+        """
+        This method returns a 64 bit hash of every row of a population matrix that only depends on the set of undirected edges of the tour,
+        so the rotations and the reversal of a tour hash the same. Every edge is mixed with the splitmix64 finalizer and the mixes are summed,
+        block by block under gather_budget like the scoring.
+        """
+        n, m = population.shape
+        hashes = np.empty(n, dtype=np.uint64)
+        rows = max(1, self.gather_budget // max(1, m))
+        for start in range(0, n, rows):
+            block = population[start:start + rows].astype(np.uint64)
+            following = np.roll(block, -1, axis=1)
+            z = np.minimum(block, following) * np.uint64(m) + np.maximum(block, following) + np.uint64(0x9E3779B97F4A7C15)
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            hashes[start:start + rows] = (z ^ (z >> np.uint64(31))).sum(axis=1, dtype=np.uint64)
+        return hashes
+
+    def cached_lengths(self, population: np.ndarray, score) -> np.ndarray:
+        """
+        This method returns the tour lengths of a population matrix through the fitness cache, only the distinct tours missing from it are scored by score.
+        """
+        hashes, first, inverse = np.unique(self.tour_hashes(population), return_index=True, return_inverse=True)
+        lengths, missing = self.fitness_cache.lookup(hashes)
+        if missing.any():
+            lengths[missing] = score(population[first[missing]])
+            self.fitness_cache.store(hashes[missing], lengths[missing])
+        self.count("cache_hits", int(len(hashes) - missing.sum()))
+        self.count("cache_misses", int(missing.sum()))
+        return lengths[inverse.ravel()]
+
+    def fitness_matrix(self, lengths: np.ndarray) -> np.ndarray:
+        """
+        Array counterpart of fitness, normalizes the tour lengths of a population matrix into inverted fitness values.
+        """
+        try:
+            self.status_update("[PROCESS] Computing fitness values for each of the routes within the population matrix.")
+            return 1 - (lengths / lengths.sum()) #gives us invert fitness values!
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to compute fitness of the population matrix: "+str(e))
+
+    def select_parents_matrix(self, lengths: np.ndarray, fitness: np.ndarray, count) -> np.ndarray:
+        """
+        Array counterpart of roulette_wheel, draws the row indices of a mating pool of count parents with the selection_method operator.
+        """
+        try:
+            self.status_update("[PROCESS] Selecting the mating pool of the population matrix.")
+            chosen = getattr(self, self.selection_operators[self.selection_method])(lengths, fitness, count)
+            self.status_update("[PROCESS] Population has been narrowed down to fit population.")
+            return chosen
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to select parents from the population matrix: "+str(e))
+
+    def cutoff_selection(self, lengths: np.ndarray, fitness: np.ndarray, count) -> np.ndarray:
+        """
+        The original roulette wheel, keeps every route whose fitness is above a random cutoff,
+        the count parents are then drawn uniformly among them, or among all the routes when none is kept.
+        """
+        kept = np.flatnonzero(fitness >= self.rng.uniform(0.000, fitness.max()))
+        if len(kept) == 0:
+            kept = np.arange(len(fitness))
+        return self.rng.choice(kept, size=count)
+
+    def stochastic_universal_sampling(self, lengths: np.ndarray, fitness: np.ndarray, count) -> np.ndarray:
+        """
+        Fitness proportional selection, count equally spaced pointers over the cumulative fitness, found by binary search.
+        The fitness is windowed against the worst route first, otherwise 1 - d/total leaves every route with nearly the same share.
+        """
+        weights = fitness - fitness.min()
+        if weights.sum() <= 0:
+            weights = np.ones_like(fitness)
+        cumulative = np.cumsum(weights)
+        step = cumulative[-1] / count
+        pointers = self.rng.uniform(0, step) + step * np.arange(count)
+        chosen = np.minimum(np.searchsorted(cumulative, pointers, side="right"), len(fitness) - 1)
+        return self.rng.permutation(chosen) #pointers come out sorted, shuffle them so neighbouring parents are not alike.
+
+    def tournament_selection(self, lengths: np.ndarray, fitness: np.ndarray, count) -> np.ndarray:
+        """
+        Every slot of the mating pool goes to the shortest out of tournament_size random routes.
+        """
+        contenders = self.rng.integers(0, len(lengths), size=(count, self.tournament_size))
+        return contenders[np.arange(count), np.argmin(lengths[contenders], axis=1)]
+
+    def rank_selection(self, lengths: np.ndarray, fitness: np.ndarray, count) -> np.ndarray:
+        """
+        Linear ranking, the shortest of P routes gets weight P and the longest weight 1, drawn by binary search over the cumulative weights.
+        """
+        order = np.argsort(lengths)
+        cumulative = np.cumsum(np.arange(len(lengths), 0, -1, dtype=np.float64))
+        picks = np.searchsorted(cumulative, self.rng.uniform(0, cumulative[-1], size=count), side="right")
+        return order[np.minimum(picks, len(lengths) - 1)]
+
+    def perform_crossover_matrix(self, population: np.ndarray, pool: np.ndarray, children: np.ndarray, lengths: np.ndarray) -> tuple:
+        """
+        Array counterpart of perform_crossover, pairs up consecutive parents of the mating pool, (pool[0], pool[1]), (pool[2], pool[3]) ...
+        and applies the crossover_method operator to all pairs at once.
+        The children and their tour lengths are written into the given buffers, which are returned.
+        """
+        try:
+            self.status_update("[PROCESS] Applying crossover to selected fit population matrix.")
+            operator = getattr(self, self.crossover_operators[self.crossover_method])
+            children[:] = operator(population[pool[0::2]], population[pool[1::2]])
+            lengths[:] = self.evaluate_population(children)
+            self.status_update("[PROCESS] Created a offspring population of size: "+str(len(children)))
+            return children, lengths
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to apply crossover over population matrix: "+str(e))
+
+    def crossover_segments(self, pairs, n) -> tuple:
+        """
+        This method draws a random [lo, hi) segment for each of the crossover pairs and returns (lo, hi, in_segment mask).
+        """
+        cuts = np.sort(self.rng.integers(0, n + 1, size=(pairs, 2)), axis=1)
+        lo, hi = cuts[:, 0], cuts[:, 1]
+        positions = np.arange(n)
+        return lo, hi, (positions >= lo[:, None]) & (positions < hi[:, None])
+
+    def single_point_crossover(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        The original single point crossover, head of the first parent and tail of the second one.
+        Children are not guaranteed to be valid tours, it is kept only to reproduce the older runs.
+        """
+        cut = self.rng.integers(0, first.shape[1], size=len(first))
+        return np.where(np.arange(first.shape[1]) < cut[:, None], first, second)
+
+    def order_crossover(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        Order crossover (OX) over all pairs at once.
+        The child keeps a random segment of the first parent in place, the remaining positions are filled,
+        starting right after the segment, with the missing cities in the order they appear in the second parent.
+        """
+        pairs, n = first.shape
+        lo, hi, in_segment = self.crossover_segments(pairs, n)
+        rows = np.arange(pairs)[:, None]
+
+        segment_city = np.zeros((pairs, n), dtype=bool) #segment_city[b, c] is True when city c is in the segment of pair b.
+        segment_city[rows, first] = in_segment
+
+        order = (np.arange(n) + hi[:, None]) % n #positions/indices walked from the end of the segment, wrapping around.
+        rotated = np.take_along_axis(second, order, axis=1)
+        missing = ~np.take_along_axis(segment_city, rotated, axis=1)
+        free = ~np.take_along_axis(in_segment, order, axis=1)
+
+        child = np.where(in_segment, first, 0)
+        child[np.broadcast_to(rows, (pairs, n))[free], order[free]] = rotated[missing] #both masks hold n - (hi - lo) cells per row.
+        return child
+
+    def partially_mapped_crossover(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        Partially mapped crossover (PMX) over all pairs at once.
+        The child takes a random segment from the first parent and everything else from the second one,
+        cities of the second parent that clash with the segment are resolved through the segment mapping.
+        Only clashing cells are followed each round, so the work per child is bounded by the segment length.
+        """
+        pairs, n = first.shape
+        lo, hi, in_segment = self.crossover_segments(pairs, n)
+        rows = np.arange(pairs)[:, None]
+
+        position_in_first = np.empty_like(first)
+        position_in_first[rows, first] = np.arange(n)
+        segment_city = np.zeros((pairs, n), dtype=bool)
+        segment_city[rows, first] = in_segment
+
+        child = np.where(in_segment, first, second)
+        clash_row, clash_col = np.nonzero(~in_segment & segment_city[rows, second])
+        city = second[clash_row, clash_col]
+        while len(city):
+            city = second[clash_row, position_in_first[clash_row, city]] #follow first[k] -> second[k] inside the segment.
+            done = ~segment_city[clash_row, city]
+            child[clash_row[done], clash_col[done]] = city[done]
+            clash_row, clash_col, city = clash_row[~done], clash_col[~done], city[~done]
+        return child
+
+    def edge_assembly_crossover(self, first: np.ndarray, second: np.ndarray) -> np.ndarray:
+        """
+        Edge assembly crossover (EAX), single AB-cycle strategy, applied pair by pair.
+        """
+        return np.array([self.edge_assembly_child(a, b) for a, b in zip(first, second)], dtype=np.int32).reshape(first.shape)
+
+    def edge_assembly_child(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        This method builds one EAX child out of parents a and b:
+        1. a random walk alternating a-edges and b-edges (shared edges excluded) until it closes an AB-cycle.
+        2. the a-edges of the AB-cycle are removed from parent a and its b-edges are added, which may split it in subtours.
+        3. the smallest subtour is repeatedly merged into a neighboring one with the cheapest 2-exchange.
+        """
+        n = len(a)
+        adj_a = [[0, 0] for _ in range(n)]
+        adj_b = [[0, 0] for _ in range(n)]
+        for tour, adj in ((a.tolist(), adj_a), (b.tolist(), adj_b)):
+            for k in range(n):
+                adj[tour[k]][0] = tour[k - 1]
+                adj[tour[k]][1] = tour[(k + 1) % n]
+
+        free_a = [[c for c in adj_a[v] if c not in adj_b[v]] for v in range(n)] #edges only in a.
+        free_b = [[c for c in adj_b[v] if c not in adj_a[v]] for v in range(n)] #edges only in b.
+        starts = [v for v in range(n) if free_a[v]]
+        if not starts:
+            return a.copy() #the parents are the same tour.
+
+        #1. random walk until an AB-cycle closes on a node reached through a b-edge.
+        current = starts[int(self.rng.integers(len(starts)))]
+        path = [current]
+        seen = {current: 0}
+        take_a = True
+        while True:
+            pool = free_a if take_a else free_b
+            if not pool[current]:
+                return a.copy()
+            nxt = pool[current][int(self.rng.integers(len(pool[current])))]
+            pool[current].remove(nxt)
+            pool[nxt].remove(current)
+            path.append(nxt)
+            current = nxt
+            take_a = not take_a
+            if take_a:
+                if current in seen:
+                    cycle = path[seen[current]:]
+                    break
+                seen[current] = len(path) - 1
+
+        #2. apply the AB-cycle to parent a.
+        adj = [list(pair) for pair in adj_a]
+        for k in range(0, len(cycle) - 1, 2):
+            u, v = cycle[k], cycle[k + 1]
+            adj[u][adj[u].index(v)] = -1
+            adj[v][adj[v].index(u)] = -1
+        for k in range(1, len(cycle) - 1, 2):
+            u, v = cycle[k], cycle[k + 1]
+            adj[u][adj[u].index(-1)] = v
+            adj[v][adj[v].index(-1)] = u
+
+        #3. merge subtours, smallest first.
+        label = [-1] * n
+        subtours = list()
+        for v in range(n):
+            if label[v] != -1:
+                continue
+            nodes = self.walk_adjacency(adj, v)
+            for node in nodes:
+                label[node] = len(subtours)
+            subtours.append(nodes)
+
+        alive = set(range(len(subtours)))
+        while len(alive) > 1:
+            smallest = min(alive, key=lambda t: len(subtours[t]))
+            nodes = self.walk_adjacency(adj, subtours[smallest][0])
+            outside = np.array([label[v] != smallest for v in range(n)])
+            best = None
+            for k, u in enumerate(nodes):
+                u2 = nodes[(k + 1) % len(nodes)]
+                row = self.edge_lengths(np.full(n, u), np.arange(n)).astype(np.float64)
+                row[~outside] = np.inf
+                candidates = np.argpartition(row, min(8, n - 1))[:min(8, int(outside.sum()))]
+                for v in candidates.tolist():
+                    for v2 in adj[v]:
+                        removed = self.edge_lengths(u, u2) + self.edge_lengths(v, v2)
+                        for x, y in ((v, v2), (v2, v)):
+                            gain = self.edge_lengths(u, x) + self.edge_lengths(u2, y) - removed
+                            if best is None or gain < best[0]:
+                                best = (gain, u, u2, x, y)
+            _, u, u2, x, y = best
+            adj[u][adj[u].index(u2)] = x
+            adj[u2][adj[u2].index(u)] = y
+            adj[x][adj[x].index(y)] = u
+            adj[y][adj[y].index(x)] = u2
+            target = label[x]
+            for v in nodes:
+                label[v] = target
+            subtours[target] = subtours[target] + nodes
+            alive.remove(smallest)
+
+        return np.array(self.walk_adjacency(adj, int(a[0])), dtype=np.int32)
+
+    def walk_adjacency(self, adj, start) -> list:
+        """
+        This method follows a degree two adjacency list from start and returns the nodes of the cycle in order.
+        """
+        nodes = [start]
+        previous, current = start, adj[start][0]
+        while current != start:
+            nodes.append(current)
+            previous, current = current, (adj[current][1] if adj[current][0] == previous else adj[current][0])
+        return nodes
+
+    def apply_mutation_matrix(self, population: np.ndarray, lengths: np.ndarray, mutation_rate = None) -> int:
+        """
+        Array counterpart of apply_mutation, every row has a mutation_rate% (self.mutation_rate by default) chance of being mutated with the mutation_method operator.
+        Rows are mutated in place and their cached lengths are moved by the delta of the mutation, returns the number of mutated rows.
+        """
+        try:
+            self.status_update("[PROCESS] Trying to apply mutation over child population matrix!")
+            n_rows = len(population)
+            mutation_rate = self.mutation_rate if mutation_rate is None else mutation_rate
+            chosen = np.flatnonzero(self.rng.integers(1, 101, size=n_rows) <= mutation_rate)
+            mutated = population[chosen]
+            delta = getattr(self, self.mutation_operators[self.mutation_method])(mutated)
+            population[chosen] = mutated
+            lengths[chosen] += delta
+            self.status_update("[PROCESS] Out of %d from child population a total of %d have undergone mutation."%(n_rows, len(chosen)))
+            return len(chosen)
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to mutate the population matrix: "+str(e))
+
+    def position_edges(self, tours: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        """
+        This method returns the lengths of the edges leaving the given positions, (tour[k], tour[k + 1]) for each row of tours.
+        """
+        rows = np.arange(len(tours))[:, None]
+        n = tours.shape[1]
+        return self.edge_lengths(tours[rows, positions % n], tours[rows, (positions + 1) % n]).astype(np.float64)
+
+    def swap_mutation(self, tours: np.ndarray) -> np.ndarray:
+        """
+        Swaps two random cities of every row.
+        The delta only looks at the (up to four) edges around the two positions, shared edges are counted once.
+        """
+        n_rows, n = tours.shape
+        rows = np.arange(n_rows)
+        i = self.rng.integers(0, n, size=n_rows)
+        j = self.rng.integers(0, n, size=n_rows)
+
+        touched = np.sort(np.stack(((i - 1) % n, i, (j - 1) % n, j), axis=1), axis=1)
+        once = np.ones(touched.shape, dtype=bool)
+        once[:, 1:] = touched[:, 1:] != touched[:, :-1]
+
+        before = self.position_edges(tours, touched)
+        tours[rows, i], tours[rows, j] = tours[rows, j], tours[rows, i]
+        after = self.position_edges(tours, touched)
+        return ((after - before) * once).sum(axis=1)
+
+    def two_opt_mutation(self, tours: np.ndarray) -> np.ndarray:
+        """
+        Reverses a random segment tour[i + 1 .. j] of every row, which replaces the edges (i, i + 1) and (j, j + 1).
+        """
+        n_rows, n = tours.shape
+        rows = np.arange(n_rows)[:, None]
+        cuts = np.sort(self.rng.integers(0, n, size=(n_rows, 2)), axis=1)
+        i, j = cuts[:, :1], cuts[:, 1:]
+
+        a, b = tours[rows, i], tours[rows, np.minimum(i + 1, n - 1)]
+        c, d = tours[rows, j], tours[rows, (j + 1) % n]
+        delta = (self.edge_lengths(a, c) + self.edge_lengths(b, d) - self.edge_lengths(a, b) - self.edge_lengths(c, d)).astype(np.float64)
+
+        positions = np.arange(n)
+        source = np.where((positions > i) & (positions <= j), i + 1 + j - positions, positions)
+        tours[:] = np.take_along_axis(tours, source, axis=1)
+        return np.where(i == j, 0.0, delta)[:, 0]
+
+    def or_opt_mutation(self, tours: np.ndarray) -> np.ndarray:
+        """
+        Moves a random segment of one to three cities of every row between two other neighbouring cities.
+        Three edges are removed, (prev, first), (last, next) and (a, b), and three are added, (prev, next), (a, first) and (last, b).
+        """
+        n_rows, n = tours.shape
+        if n < 4:
+            return np.zeros(n_rows)
+        rows = np.arange(n_rows)[:, None]
+        size = np.minimum(self.rng.integers(1, 4, size=(n_rows, 1)), n - 3)
+        i = self.rng.integers(0, n - size + 1)
+        j = (i + size + self.rng.integers(0, n - size - 1)) % n #anywhere but inside the segment or right before it.
+
+        prev, first = tours[rows, (i - 1) % n], tours[rows, i]
+        last, nxt = tours[rows, i + size - 1], tours[rows, (i + size) % n]
+        a, b = tours[rows, j], tours[rows, (j + 1) % n]
+        delta = (self.edge_lengths(prev, nxt) + self.edge_lengths(a, first) + self.edge_lengths(last, b)
+                 - self.edge_lengths(prev, first) - self.edge_lengths(last, nxt) - self.edge_lengths(a, b)).astype(np.float64)
+
+        p = np.arange(n)
+        before = np.select(
+            [p <= j, p <= j + size, p < i + size],
+            [p, i + (p - j - 1), p - size],
+            p) #segment moved back: tour[..j], segment, tour[j + 1..i - 1], tour[i + size..]
+        after = np.select(
+            [p < i, p <= j - size, p <= j],
+            [p, p + size, i + (p - (j - size + 1))],
+            p) #segment moved forward: tour[..i - 1], tour[i + size..j], segment, tour[j + 1..]
+        tours[:] = np.take_along_axis(tours, np.where(j < i, before, after), axis=1)
+        return delta[:, 0]
+
+    def build_neighbor_lists(self, k) -> None:
+        """
+        This method stores the k nearest cities of every city, sorted by distance, in neighbors and their distances in neighbor_gaps.
+        Plane euclidean instances query a grid index over the coordinates, other distances are scanned block by block.
+        """
+        try:
+            n = self.number_of_cities
+            k = min(k, n - 1)
+            self.status_update("[PROCESS] Building %d nearest neighbour lists for %d cities."%(k, n))
+            self.neighbors, self.neighbor_gaps = list(), list()
+            if self.planar() and k > 0:
+                nearest = CityGrid(self.coordinates).nearest_k(k)
+                gaps = self.edge_lengths(np.arange(n)[:, None], nearest).astype(np.float64)
+                order = np.argsort(gaps, axis=1, kind="stable")
+                self.neighbors = np.take_along_axis(nearest, order, axis=1).tolist()
+                self.neighbor_gaps = np.take_along_axis(gaps, order, axis=1).tolist()
+                return
+            rows = max(1, self.gather_budget // max(1, n))
+            for a in range(0, n, rows):
+                cities = np.arange(a, min(n, a + rows))
+                block = self.edge_lengths(cities[:, None], np.arange(n)[None, :]).astype(np.float64)
+                block[np.arange(len(cities)), cities] = np.inf #a city is not its own neighbour.
+                nearest = np.argpartition(block, k - 1, axis=1)[:, :k] if k > 0 else np.empty((len(cities), 0), dtype=np.int64)
+                gaps = np.take_along_axis(block, nearest, axis=1)
+                order = np.argsort(gaps, axis=1)
+                self.neighbors.extend(np.take_along_axis(nearest, order, axis=1).tolist())
+                self.neighbor_gaps.extend(np.take_along_axis(gaps, order, axis=1).tolist())
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to build the nearest neighbour lists: "+str(e))
+
+    def apply_local_search(self, population: np.ndarray, lengths: np.ndarray) -> tuple:
+        """
+        Memetic stage, improves the rows of the population with improve_tour until the local_search_moves or local_search_time budget of this generation runs out.
+        Rows and their cached lengths are updated in place with the gains of the applied moves, both are returned.
+        """
+        try:
+            if self.neighbors is None:
+                self.build_neighbor_lists(self.neighbor_count)
+            self.status_update("[PROCESS] Applying local search over child population matrix.")
+            deadline = None if self.local_search_time is None else time.perf_counter() + self.local_search_time
+            moves_left = np.inf if self.local_search_moves is None else self.local_search_moves
+            improved = 0
+            for row in range(len(population)):
+                if moves_left <= 0 or (deadline is not None and time.perf_counter() > deadline):
+                    break
+                tour, delta, moves = self.improve_tour(population[row], moves_left, deadline)
+                if moves:
+                    population[row] = tour
+                    lengths[row] = lengths[row] + delta
+                    improved = improved + 1
+                moves_left = moves_left - moves
+            self.status_update("[PROCESS] Local search has improved %d out of %d routes."%(improved, len(population)))
+            return population, lengths
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to apply local search: "+str(e))
+
+    def improve_tour(self, tour: np.ndarray, moves_left, deadline) -> tuple:
+        """
+        This method runs 2-opt and Or-opt over a single tour, only the moves towards a city from the neighbour list are tried.
+        A city whose moves all failed gets its don't-look bit set and is not tried again until one of its tour edges changes.
+        Returns the improved tour, the total change in length and the number of moves applied.
+        """
+        n = len(tour)
+        if n < 5:
+            return tour, 0.0, 0
+        tour = tour.tolist()
+        pos = [0] * n
+        for k, city in enumerate(tour):
+            pos[city] = k
+        dist = self.edge_length
+        neighbors, gaps = self.neighbors, self.neighbor_gaps
+        succ = lambda city: tour[(pos[city] + 1) % n]
+        pred = lambda city: tour[pos[city] - 1]
+
+        def write(start, cities):
+            for k, city in enumerate(cities):
+                tour[(start + k) % n] = city
+                pos[city] = (start + k) % n
+
+        def read(first, last):
+            return [tour[(pos[first] + k) % n] for k in range((pos[last] - pos[first]) % n + 1)]
+
+        def reverse(first, last):
+            if 2 * ((pos[last] - pos[first]) % n + 1) > n:
+                first, last = succ(last), pred(first) #reversing the other side gives the same cycle.
+            write(pos[first], read(first, last)[::-1])
+
+        look = [True] * n #inverted don't-look bits.
+        active = list(tour)
+        total, moves = 0.0, 0
+        while active and moves < moves_left:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            a = active.pop()
+            if not look[a]:
+                continue
+            touched = None
+
+            #2-opt, the new edge (a, c) replaces (a, b) and (c, d) on the same side of a and c.
+            for side in (succ, pred):
+                b = side(a)
+                gap_ab = dist(a, b)
+                for c, gap_ac in zip(neighbors[a], gaps[a]):
+                    if gap_ac >= gap_ab:
+                        break
+                    d = side(c)
+                    if c == b or d == a:
+                        continue
+                    delta = gap_ac + dist(b, d) - gap_ab - dist(c, d)
+                    if delta < -1e-9:
+                        if side is succ:
+                            reverse(b, c)
+                        else:
+                            reverse(a, d)
+                        touched = (a, b, c, d)
+                        break
+                if touched:
+                    break
+
+            #Or-opt, the segment a..e of up to three cities is moved next to a neighbour c of a.
+            e = a
+            for _ in range(3):
+                if touched or succ(e) == a:
+                    break
+                p, nx = pred(a), succ(e)
+                segment = read(a, e)
+                removed = dist(p, a) + dist(e, nx) - dist(p, nx)
+                for c, gap_ac in zip(neighbors[a], gaps[a]):
+                    if gap_ac >= removed:
+                        break
+                    if c in segment:
+                        continue
+                    for d in (succ(c), pred(c)):
+                        if d in segment:
+                            continue
+                        delta = gap_ac + dist(e, d) - dist(c, d) - removed
+                        if delta >= -1e-9:
+                            continue
+                        if d == succ(c): #p [a..e] nx .. c d  ->  p nx .. c [a..e] d
+                            if (pos[c] - pos[nx]) % n < n // 2:
+                                write(pos[a], read(nx, c) + segment)
+                            else:
+                                write(pos[d], segment + read(d, p))
+                        else: #p [a..e] nx .. d c  ->  p nx .. d [e..a] c
+                            if (pos[d] - pos[nx]) % n < n // 2:
+                                write(pos[a], read(nx, d) + segment[::-1])
+                            else:
+                                write(pos[c], segment[::-1] + read(c, p))
+                        touched = (p, nx, a, e, c, d)
+                        break
+                    if touched:
+                        break
+                e = succ(e)
+
+            if touched:
+                total, moves = total + delta, moves + 1
+                for city in touched:
+                    look[city] = True
+                    active.append(city)
+            else:
+                look[a] = False
+        return np.array(tour, dtype=np.int32), total, moves
+
+    def get_population_results_matrix(self, population: np.ndarray, lengths: np.ndarray, fitness: np.ndarray) -> dict:
+        """
+        Array counterpart of get_population_results, the statistics are reduced straight off the length and fitness arrays.
+        The diversity is the average share of edges that diversity_sample evenly spaced routes do not have in common with the best one.
+        """
+        try:
+            self.status_update("[PROCESS] Computing statistics for latest generation please wait.")
+            best = int(np.argmin(lengths))
+            stats = {
+                "generation": self.generation + 1,
+                "best_path": population[best].copy(),
+                "best_distance": float(lengths[best]),
+                "best_fitness": float(fitness[best]),
+                "average_distance": float(lengths.mean()),
+                "std_distance": float(lengths.std()),
+                "average_fitness": float(fitness.mean()),
+                "diversity": self.population_diversity(population, best)
+            }
+            self.status_update("[PROCESS] Stats for the latest generation are now ready.")
+            return stats
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to compute statistics of the population matrix: "+str(e))
+
+    def population_diversity(self, population: np.ndarray, best) -> float:
+        """
+        This method returns the share of edges of a sample of the population that are not in the route population[best], 0.0 when all routes are the same.
+        """
+        rows, n = population.shape
+        sample = population[np.unique(np.linspace(0, rows - 1, min(rows, self.diversity_sample)).astype(np.int64))]
+        successor = np.empty(n, dtype=population.dtype)
+        successor[population[best]] = np.roll(population[best], -1)
+        following = np.roll(sample, -1, axis=1)
+        shared = (successor[sample] == following) | (successor[following] == sample)
+        return float(1.0 - shared.mean())
+
     def plot_best_path_of_all_generations(self, generations):
         """
         Plots the best path across all provided generations.
 
         :param generations: List of dictionaries containing stats about each generation.
         """
+        import matplotlib.pyplot as plt
+
         # Extract the path with the shortest distance from all generations
-        best_gen = min(generations, key=lambda x: x["best_distance"])
+        if isinstance(generations, StatsHistory):
+            best_gen = {"best_distance": generations.best_distance, "best_path": generations.best_path()}
+        else:
+            best_gen = min(generations, key=lambda x: x["best_distance"])
         best_path = list(map(int, best_gen['best_path'].split(',')))
         
         print("Here's the best path: ", best_path)
-        # Extract x and y coordinates from best path for plotting
-        x_coords = [i for i, _ in enumerate(best_path)]
-        y_coords = best_path
+        # Extract x and y coordinates from best path for plotting, the map of the tour when the cities have coordinates
+        if self.coordinates is not None:
+            x_coords, y_coords = self.coordinates[best_path + best_path[:1]].T
+        else:
+            x_coords = [i for i, _ in enumerate(best_path)]
+            y_coords = best_path
 
         # Plotting
         plt.figure(figsize=(10, 6))
@@ -348,8 +2103,8 @@ class TSP():
         plt.scatter(x_coords, y_coords, c='red')  # Highlight each city as a point
 
         plt.title('Best Path Across All Generations')
-        plt.xlabel('City Index')
-        plt.ylabel('City Order in Path')
+        plt.xlabel('X' if self.coordinates is not None else 'City Index')
+        plt.ylabel('Y' if self.coordinates is not None else 'City Order in Path')
         plt.legend()
         plt.grid(True)
         plt.show()
@@ -358,23 +2113,32 @@ class TSP():
     def plot_best_path_evolution(self, generations):
         """
         Plots the evolution of the best path over the provided generations.
+        Only the generations that improved the best path are drawn, at most plot_path_lines of them spread over the run, the last one included.
 
         :param generations: List of dictionaries containing stats about each generation.
         """
-        # Extract the best paths and convert them to lists of integers
-        best_paths = [list(map(int, gen['best_path'].split(','))) for gen in generations]
-
-        
+        import matplotlib.pyplot as plt
+
+        # Extract the improving best paths and convert them to lists of integers
+        if isinstance(generations, StatsHistory):
+            improvements = [(row + 1, path.tolist()) for row, path in zip(generations.best_rows, generations.best_paths)]
+        else:
+            improvements = list()
+            for generation, gen in enumerate(generations):
+                if not improvements or gen['best_path'] != previous:
+                    improvements.append((generation + 1, list(map(int, gen['best_path'].split(',')))))
+                    previous = gen['best_path']
+        keep = np.unique(np.linspace(0, len(improvements) - 1, min(len(improvements), self.plot_path_lines)).round().astype(int))
+        improvements = [improvements[k] for k in keep]
 
         # Extract x and y coordinates from best path for plotting
-        x_coords = [i for i, _ in enumerate(best_paths[0])]
-        y_coords = best_paths
+        x_coords = [i for i, _ in enumerate(improvements[0][1])]
 
         # Plotting
         plt.figure(figsize=(10, 6))
 
-        for generation, y in enumerate(y_coords):
-            plt.plot(x_coords, y, label=f'Generation {generation + 1}')
+        for generation, y in improvements:
+            plt.plot(x_coords, y, label=f'Generation {generation}')
 
         plt.title('Best Path Across Generations')
         plt.xlabel('City Index')
@@ -382,9 +2146,6 @@ class TSP():
         plt.legend()
         plt.show()
 
-# Sample usage
-# generations = [ { ... }, { ... }, ... ]  # your list of dictionaries
-# plot_best_path_evolution(generations)
     def verify_stats(self, stats) -> bool:
         """
         This method varifies if the results of the current generation are valid or not.
@@ -393,7 +2154,7 @@ class TSP():
             if stats is None:
                 return False
             else:
-                if stats["best_path"] == "":
+                if len(stats["best_path"]) == 0:
                     return False
                 elif stats["best_distance"] == 0:
                     return False
@@ -407,13 +2168,29 @@ class TSP():
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to verify results for a generation: "+str(e))
 
-    import matplotlib.pyplot as plt
+    def plot_all(self) -> None:
+        """
+        This method shows all the plots of the run, only when plotting or live plotting is enabled and the run was not plotted live,
+        e.g. with islands or when the live plot could not start.
+        """
+        if not (self.plot or self.live_plot) or self.plot_process is not None or not self.generations:
+            return
+        self.plot_best_path_evolution(self.generations)
+        self.plot_results(self.generations)
+        self.plot_best_path_of_all_generations(self.generations)
 
     def plot_results(self, generations):
-        # Extracting values
-        gen_numbers = list(range(1, len(generations) + 1))
-        best_distances = [gen['best_distance'] for gen in generations]
-        average_distances = [gen['average_distance'] for gen in generations]
+        import matplotlib.pyplot as plt
+
+        # Extracting values, every stride-th generation so at most plot_points of them are drawn
+        if isinstance(generations, StatsHistory):
+            gen_numbers, best_distances, average_distances = (generations.column(field) for field in ("generation", "best_distance", "average_distance"))
+        else:
+            gen_numbers = np.arange(1, len(generations) + 1)
+            best_distances = np.array([gen['best_distance'] for gen in generations])
+            average_distances = np.array([gen['average_distance'] for gen in generations])
+        stride = max(1, -(-len(gen_numbers) // self.plot_points))
+        gen_numbers, best_distances, average_distances = gen_numbers[::stride], best_distances[::stride], average_distances[::stride]
         
         plt.figure(figsize=(14, 6))
         
@@ -452,32 +2229,385 @@ class TSP():
 
 
 
-    def run(self) -> None:
+    def start_live_plot(self) -> None:
+        """
+        This method starts the live plotting process, it is fed through a queue by publish_plot so the solver never waits on matplotlib.
+        """
+        try:
+            context = multiprocessing.get_context("spawn")
+            self.plot_queue = context.Queue()
+            self.plot_rows = list()
+            self.plot_process = context.Process(target=live_plot_loop, args=(self.plot_queue, self.coordinates, self.plot_fps, self.plot_points))
+            self.plot_process.start()
+        except Exception as e:
+            self.plot_rows = None
+            self.plot_process = None
+            self.status_update("[ERR] The following error occured while trying to start the live plot: "+str(e))
+
+    def publish_plot(self, stats) -> None:
+        """
+        This method queues the stats of a generation for the live plot.
+        Rows are batched and sent at most plot_fps times per second, along with the best path when it improved since the last batch.
+        """
+        if self.plot_rows is None:
+            return
+        generation = stats.get("generation", self.generations.count)
+        self.plot_rows.append((generation, stats["best_distance"], stats["average_distance"], stats.get("diversity", np.nan)))
+        now = time.perf_counter()
+        if now >= self.next_plot:
+            self.next_plot = now + 1.0 / self.plot_fps
+            self.send_plot()
+
+    def send_plot(self) -> None:
+        path = None
+        if self.generations.best_distance < self.plotted_distance:
+            self.plotted_distance = self.generations.best_distance
+            path = np.array(self.generations.best_path().split(','), dtype=np.int64)
+        self.plot_queue.put((self.plot_rows, path, self.plotted_distance))
+        self.plot_rows = list()
+
+    def stop_live_plot(self) -> None:
+        """
+        This method flushes the last stats to the live plot and tells it the run is over, its window stays open until it is closed.
+        The queue itself is kept, the plotting process may still be attaching to it.
+        """
+        if self.plot_rows is None:
+            return
+        if self.plot_rows:
+            self.send_plot()
+        self.plot_rows = None
+        self.plot_queue.put(None)
+        self.plot_queue.close()
+        self.plot_queue.join_thread()
+
+    def start_population(self) -> None:
+        """
+        This method creates and scores the first population, and allocates the child buffers the generations are written into.
+        """
+        self.population = self.create_population_matrix(self.population_size) #create population
+        self.population_lengths = self.evaluate_population(self.population)
+        self.child_population = np.empty_like(self.population)
+        self.child_lengths = np.empty_like(self.population_lengths)
+
+    def evolve_generation(self) -> dict:
+        """
+        This method runs one generation of the array population mode.
+        The elitism share of the shortest routes is copied into the child buffer unchanged, the rest of the buffer is filled
+        with the children of the mating pool, which are then mutated and improved.
+        The parent and child buffers are swapped at the end, so the children become self.population, returns their stats.
+        """
+        size = len(self.population)
+        elites = min(size, int(round(self.elitism * size)))
+        if elites:
+            best = np.argpartition(self.population_lengths, elites - 1)[:elites]
+            self.child_population[:elites] = self.population[best]
+            self.child_lengths[:elites] = self.population_lengths[best]
+
+        children, lengths = self.child_population[elites:], self.child_lengths[elites:]
+        with self.stage("fitness"):
+            fitness = self.fitness_matrix(self.population_lengths)
+        with self.stage("selection"):
+            pool = self.select_parents_matrix(self.population_lengths, fitness, 2 * len(children))
+        with self.stage("crossover"):
+            self.perform_crossover_matrix(self.population, pool, children, lengths)
+            if self.metrics is not None:
+                seen = np.zeros(children.shape, dtype=bool)
+                seen[np.arange(len(children))[:, None], children] = True
+                valid = int(seen.all(axis=1).sum())
+                self.count("valid_children", valid)
+                self.count("invalid_children", len(children) - valid)
+        with self.stage("mutation"):
+            self.count("mutations", self.apply_mutation_matrix(children, lengths))
+        if self.local_search:
+            with self.stage("local_search"):
+                self.apply_local_search(children, lengths)
+
+        self.population, self.child_population = self.child_population, self.population
+        self.population_lengths, self.child_lengths = self.child_lengths, self.population_lengths
+        with self.stage("statistics"):
+            return self.get_population_results_matrix(self.population, self.population_lengths, self.fitness_matrix(self.population_lengths))
+
+    def add_generation_callback(self, callback) -> None:
+        """
+        This method registers callback(tsp, stats) to be called after every generation of run, with the stats of that generation.
+        A callback returning a truthy value stops the run once all the callbacks of the generation have been called.
+        The islands evolve in processes of their own and do not call them.
+        """
+        self.generation_callbacks.append(callback)
+
+    def notify_generation(self, stats) -> bool:
+        """
+        This method calls every generation callback with stats and returns whether any of them asked to stop the run.
+        """
+        stop = False
+        for callback in self.generation_callbacks:
+            stop = bool(callback(self, stats)) or stop
+        if stop:
+            self.status_update("[BREAK] Stopped by a generation callback after generation %d."%(self.generations.count))
+        return stop
+
+    def step(self) -> dict:
+        """
+        This method evolves one generation of the array population mode along with its bookkeeping:
+        stats history, progress, checkpoint, metrics and live plot. Returns the stats of the generation.
+        The evaluation workers and the stats file are released once the last generation is reached,
+        callers that stop stepping earlier release them with close, or step inside a with block.
+        """
+        if self.population is None:
+            self.start_population()
+        stats = self.evolve_generation()
+        self.generation = self.generation + 1
+        if self.verify_stats(stats=stats):
+            self.generations.append(stats)
+        self.status_update("[PROCESS] Current child population shall become ordinary population for next generation.")
+        self.report_progress("Generation %d of %d, best distance %.4f"%(self.generation, self.iterations, stats["best_distance"]))
+        if self.checkpoint_file is not None and self.generation % self.checkpoint_interval == 0:
+            with self.stage("checkpoint"):
+                self.save_checkpoint(self.checkpoint_file)
+        self.publish_metrics(stats)
+        self.publish_plot(stats)
+        if self.generation >= self.iterations:
+            self.close()
+        return stats
+
+    def close(self) -> None:
+        """
+        This method releases the evaluation workers, their shared distance matrix and the stats file, a later step starts the workers again.
+        """
+        self.stop_workers()
+        self.generations.close()
+
+    def __enter__(self) -> "TSP":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def run_matrix(self) -> None:
+        """
+        Driver for the array population mode, runs the same stages as run but over the int32 population matrix, one step per generation.
+        A run rebuilt by resume carries on from its saved generation.
+        """
+        try:
+            if self.population is None:
+                self.start_population()
+
+            while self.generation < self.iterations:
+                stats = self.step()
+                if self.notify_generation(stats):
+                    break
+
+            self.stop_workers()
+            self.generations.close()
+            if self.generations:
+                self.report_progress("Generation %d of %d, best distance %.4f"%(self.generation, self.iterations, self.generations[-1]["best_distance"]), force=True)
+            self.plot_all()
+        except Exception as e:
+            self.stop_workers()
+            self.status_update("[ERR] The following error occured while trying to run the module: "+str(e))
+
+    def save_checkpoint(self, path) -> None:
+        """
+        This method saves the state of an array mode run into an uncompressed .npz file:
+        the population matrix, its cached lengths, the stats history, and a json header with the settings, the rng states and the generation counter.
+        The file is written next to path first and then renamed over it, so a crash never leaves a half written checkpoint.
+        """
+        try:
+            self.status_update("[PROCESS] Saving checkpoint of generation %d to %s"%(self.generation, path))
+            settings = {field: getattr(self, field) for field in self.settings_fields}
+            settings["distance_dtype"] = np.dtype(self.distance_dtype).name
+            header = {
+                "settings": settings,
+                "number_of_cities": self.number_of_cities,
+                "population_size": self.population_size,
+                "iterations": self.iterations,
+                "mutation_rate": self.mutation_rate,
+                "initial_rng_state": self.initial_rng_state,
+                "rng_state": self.rng.bit_generator.state,
+                "generation": self.generation,
+            }
+            temporary = path + ".tmp"
+            with open(temporary, "wb") as handle:
+                np.savez(handle, header=np.array(json.dumps(header)), population=self.population, population_lengths=self.population_lengths,
+                         **self.generations.to_arrays())
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, path)
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to save a checkpoint: "+str(e))
+
+    @classmethod
+    def resume(cls, path, **overrides) -> "TSP":
+        """
+        Rebuilds an array mode run from a checkpoint written by save_checkpoint, run() then carries on from the saved generation
+        exactly as the original run would have.
+        The distances are drawn again from the saved initial rng state, or reused from distance_file, so they come out identical.
+        overrides are passed on to the constructor, e.g. a larger iterations, plot or verbosity.
+        """
+        with np.load(path) as checkpoint:
+            header = json.loads(str(checkpoint["header"]))
+            population = checkpoint["population"]
+            population_lengths = checkpoint["population_lengths"]
+            stats = {name: checkpoint[name] for name in checkpoint.files if name.startswith("stats_")}
+
+        options = dict(header["settings"])
+        options.update(n_cities=header["number_of_cities"], population_size=header["population_size"],
+                       iterations=header["iterations"], mutation_rate=header["mutation_rate"],
+                       initial_rng_state=header["initial_rng_state"])
+        options.update(overrides)
+        obj = cls(**options)
+        obj.status_update("[INFO] Resuming from generation %d of %s"%(header["generation"], path))
+        obj.rng.bit_generator.state = header["rng_state"]
+        obj.generation = header["generation"]
+        obj.generations = StatsHistory.from_arrays(stats, obj.stats_file, truncate=obj.stats_file == header["settings"].get("stats_file"))
+        obj.population = population
+        obj.population_lengths = population_lengths
+        obj.child_population = np.empty_like(population)
+        obj.child_lengths = np.empty_like(population_lengths)
+        return obj
+
+    def migration_target(self, island, epoch) -> int:
+        """
+        This method returns the island that island sends its migrants to at the given migration epoch.
+        The random topology draws one random cycle through all the islands per epoch from migration_seed, a shuffled order
+        shifted by 1 to islands - 1 places, so every island receives exactly one batch and never its own.
+        """
+        if self.migration_topology == "random":
+            rng = np.random.default_rng([self.migration_seed, epoch])
+            order = rng.permutation(self.islands)
+            targets = np.empty(self.islands, dtype=np.int64)
+            targets[order] = np.roll(order, -int(rng.integers(1, self.islands)))
+            return int(targets[island])
+        return (island + 1) % self.islands
+
+    def evolve_island(self, island, inboxes) -> tuple:
+        """
+        Body of an island process, evolves its own population for iterations generations.
+        Every migration_interval generations the best migrants routes are sent to migration_target and
+        the batch received from another island replaces the worst routes of the population.
+        Returns the generations of the island along with its best route and distance.
+        """
+        self.workers = 1 #islands already use one process each.
+        self.generations = StatsHistory(self.stats_capacity) #only the merged history goes to stats_file.
+        self.start_population()
+        for generation in range(self.iterations):
+            stats = self.evolve_generation()
+            self.generation = generation + 1
+            if self.verify_stats(stats=stats):
+                self.generations.append(stats)
+
+            if (generation + 1) % self.migration_interval or generation + 1 == self.iterations:
+                continue
+            epoch = (generation + 1) // self.migration_interval
+            best = np.argsort(self.population_lengths)[:self.migrants]
+            inboxes[self.migration_target(island, epoch)].put((self.population[best], self.population_lengths[best]))
+            immigrants, immigrant_lengths = inboxes[island].get()
+            worst = np.argsort(self.population_lengths)[len(self.population) - len(immigrants):]
+            self.population[worst] = immigrants
+            self.population_lengths[worst] = immigrant_lengths
+        return self.generations, self.generations.best_path(), self.generations.best_distance
+
+    def run_islands(self) -> dict:
+        """
+        Driver for the island model, evolves islands populations of population_size in separate processes with migration between them.
+        self.island_generations keeps the generations of every island and self.generations the best island of every generation,
+        the average values of the latter are averaged over all islands.
+        Returns the global best route and distance along with the generations of every island.
+        When an island fails or dies the remaining ones are terminated, as they would wait forever for its migrants.
+        """
+        processes = list()
+        try:
+            self.status_update("[PROCESS] Starting %d islands with a %s migration topology."%(self.islands, self.migration_topology))
+            self.migration_seed = int(self.rng.integers(2**63))
+            seeds = self.rng.integers(2**63, size=self.islands)
+            inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+            results = multiprocessing.Queue()
+            for island in range(self.islands):
+                process = multiprocessing.Process(target=run_island, args=(self, island, int(seeds[island]), inboxes, results), daemon=True)
+                process.start()
+                processes.append(process)
+
+            finished = dict() #drain the results before joining.
+            while len(finished) < self.islands:
+                try:
+                    island, result, error = results.get(timeout=self.island_poll)
+                except queue.Empty:
+                    for island, process in enumerate(processes):
+                        if island not in finished and process.exitcode not in (None, 0): #an island that exits cleanly has posted its result.
+                            raise RuntimeError("island %d exited with code %d"%(island, process.exitcode))
+                    continue
+                if error is not None:
+                    raise RuntimeError("island %d failed with %s"%(island, error))
+                finished[island] = result
+            for process in processes:
+                process.join()
+
+            self.island_generations = [finished[island][0] for island in range(self.islands)]
+            self.generations = StatsHistory(self.stats_capacity, self.stats_file)
+            for stats in zip(*self.island_generations):
+                best = dict(min(stats, key=lambda x: x["best_distance"]))
+                for field in ("average_distance", "std_distance", "average_fitness", "diversity"):
+                    best[field] = float(np.mean([x[field] for x in stats]))
+                self.generations.append(best)
+            self.generations.close()
+
+            best_island = min(range(self.islands), key=lambda island: finished[island][2])
+            self.status_update("[INFO] Island %d found the best route with a distance of %.4f"%(best_island, finished[best_island][2]))
+            return {
+                "best_path": finished[best_island][1],
+                "best_distance": finished[best_island][2],
+                "islands": self.island_generations
+            }
+        except Exception as e:
+            self.status_update("[ERR] The following error occured while trying to run the islands: "+str(e))
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+    def run(self) -> dict:
         """
         The run method acts like the driver method for this module/class, kinda like a main function within C.
+        With profiling on, the metrics endpoint is served for the length of the run and the stage times are logged at its end.
+        With islands it returns the global best route and distance along with the generations of every island, see run_islands.
         """
         try:
+            if self.metrics_port is not None and self.metrics_server is None:
+                self.start_metrics_server()
+            if self.live_plot and self.islands <= 1:
+                self.start_live_plot()
+            elif self.live_plot:
+                self.status_update("[INFO] The live plot is not available with islands, the run is plotted once it is over.")
+            if self.population_mode == "array" and self.islands > 1:
+                result = self.run_islands()
+                self.plot_all()
+                return result
+            if self.population_mode == "array":
+                return self.run_matrix()
             i = 0
             self.population = self.create_population(self.population_size) #create population
             
             while i<self.iterations:
                 
-                print("-"*100)
-                print("\t\t\t\t\t\t Generation %d"%(len(self.generations)+1))
-                print("-"*100)
                 self.population_distance = self.create_population_distances()  #detemine total distance travelled for a route.
-                self.population_fitness = self.fitness(self.population_distance) #call the fitness function on population, by normalizing the fitness for each of the population instance.           
-                self.population_fitness = self.roulette_wheel() #performs selection from fitness generated, and then selects fit instances from samples.
+                with self.stage("fitness"):
+                    self.population_fitness = self.fitness(self.population_distance) #call the fitness function on population, by normalizing the fitness for each of the population instance.           
+                with self.stage("selection"):
+                    self.population_fitness = self.roulette_wheel() #performs selection from fitness generated, and then selects fit instances from samples.
                 if len(self.population_fitness) == 0:
                     self.status_update("[BREAK] Terminating abruptly because population size is too small!")
                     break
-                self.child_population = self.perform_crossover(self.population_fitness) #performs crossover for fit parents in an attempt to create new children that are better.
+                with self.stage("crossover"):
+                    self.child_population = self.perform_crossover(self.population_fitness) #performs crossover for fit parents in an attempt to create new children that are better.
                 if len(self.child_population) == 0:
                     self.status_update("[BREAK] Terminating abruptly because population size is too small!")
                     break
-                self.child_population.update(self.apply_mutation(self.child_population)) #apply mutation over this new population.
-                self.child_fitness = self.fitness(self.child_population)
-                stats = self.get_population_results(self.child_population, self.child_fitness)
+                with self.stage("mutation"):
+                    self.child_population.update(self.apply_mutation(self.child_population)) #apply mutation over this new population.
+                with self.stage("statistics"):
+                    self.child_fitness = self.fitness(self.child_population)
+                    stats = self.get_population_results(self.child_population, self.child_fitness)
                 
                 
                 
@@ -487,16 +2617,87 @@ class TSP():
                 else:
                     i=i-1 #recompute the results again.
                 self.population_distance = self.child_population
-                self.status_update("[INFO] Current child population shall become ordinary population for next generation.\n\n")
-                clear_screen()
+                self.status_update("[PROCESS] Current child population shall become ordinary population for next generation.")
+                self.report_progress("Generation %d of %d, best distance %.4f"%(self.generations.count, self.iterations, stats["best_distance"]))
+                self.publish_metrics(stats)
+                self.publish_plot(stats)
+                if self.notify_generation(stats):
+                    break
             
-            self.plot_best_path_evolution(self.generations)
-            self.plot_results(self.generations)
-            self.plot_best_path_of_all_generations(self.generations)
+            self.generations.close()
+            if self.generations:
+                self.report_progress("Generation %d of %d, best distance %.4f"%(self.generations.count, self.iterations, self.generations[-1]["best_distance"]), force=True)
+            self.plot_all()
         except Exception as e:
             self.status_update("[ERR] The following error occured while trying to run the module: "+str(e))
-
-
-obj = TSP()
-obj.run()
+        finally:
+            self.stop_live_plot()
+            self.stop_metrics_server()
+            if self.metrics is not None and self.metrics.counts["generations"]:
+                self.status_update("[INFO] Stage times: " + self.metrics.summary())
+            if self.fitness_cache is not None:
+                self.status_update("[INFO] Fitness cache: " + self.fitness_cache.summary())
+
+
+def main(argv = None) -> TSP:
+    """
+    Command line entry point, parameters that are not given on the command line are asked for interactively.
+    """
+    parser = argparse.ArgumentParser(description="Genetic algorithm for the travelling salesman problem.")
+    parser.add_argument("--cities", type=int, help="total number of cities.")
+    parser.add_argument("--population", type=int, help="population size.")
+    parser.add_argument("--iterations", type=int, help="number of generations.")
+    parser.add_argument("--mutation-rate", type=float, default=2, help="percentage of children mutated every generation.")
+    parser.add_argument("--seed", type=int, help="seed of the random number generators.")
+    parser.add_argument("--mode", choices=["array", "dict"], default=TSP.population_mode, help="population representation.")
+    parser.add_argument("--seeding", choices=sorted(TSP.seeding_operators), default=TSP.seeding, help="construction seeding part of the first population, space_filling_curve falls back to nearest_neighbor without coordinates.")
+    parser.add_argument("--seeding-share", type=float, default=TSP.seeding_share, help="share of the first population built by the seeding construction.")
+    parser.add_argument("--crossover", choices=sorted(TSP.crossover_operators), default=TSP.crossover_method)
+    parser.add_argument("--selection", choices=sorted(TSP.selection_operators), default=TSP.selection_method)
+    parser.add_argument("--elitism", type=float, default=TSP.elitism, help="share of the shortest routes kept unchanged every generation.")
+    parser.add_argument("--mutation", choices=sorted(TSP.mutation_operators), default=TSP.mutation_method)
+    parser.add_argument("--local-search", action="store_true", help="improve children with 2-opt / Or-opt.")
+    parser.add_argument("--workers", type=int, default=TSP.workers, help="processes scoring the population.")
+    parser.add_argument("--islands", type=int, default=TSP.islands, help="island processes, 1 for a single population.")
+    parser.add_argument("--distance-dtype", choices=["float64", "float32"], default="float64")
+    parser.add_argument("--instance", help="TSPLIB .tsp file or csv file of x,y coordinates to load the cities from, replaces --cities.")
+    parser.add_argument("--distance-storage", choices=["full", "condensed", "lazy"], default=TSP.distance_storage, help="lazy computes the distances of a coordinate instance on demand.")
+    parser.add_argument("--distance-file", help=".npy file backing the distance matrix.")
+    parser.add_argument("--distance-seed", type=int, help="seed of the random distances, defaults to one derived from --seed.")
+    parser.add_argument("--verbosity", choices=sorted(TSP.verbosity_levels), default=TSP.verbosity, help="quiet only reports errors, debug reports every stage.")
+    parser.add_argument("--fitness-cache-mb", type=float, default=0, help="memory budget of the cache of tour lengths, 0 scores every tour.")
+    parser.add_argument("--profile", action="store_true", help="time every stage and log the stage times at the end of the run.")
+    parser.add_argument("--metrics-port", type=int, help="serve the metrics of the run on this local port, as Prometheus text on /metrics and json on /metrics.json.")
+    parser.add_argument("--stats-file", help="csv file every generation's stats are appended to.")
+    parser.add_argument("--checkpoint", help=".npz file the run is checkpointed into.")
+    parser.add_argument("--checkpoint-interval", type=int, default=TSP.checkpoint_interval, help="generations between two checkpoints.")
+    parser.add_argument("--resume", help="carry on the run saved in this checkpoint, --iterations can extend it.")
+    parser.add_argument("--plot", action=argparse.BooleanOptionalAction, default=None, help="show the plots once the run is over.")
+    parser.add_argument("--live-plot", action="store_true", help="plot the run while it evolves instead of once it is over.")
+    args = parser.parse_args(argv)
+
+    if args.resume is not None:
+        overrides = {"plot": bool(args.plot), "verbosity": args.verbosity}
+        if args.iterations is not None:
+            overrides["iterations"] = args.iterations
+        obj = TSP.resume(args.resume, **overrides)
+        obj.run()
+        return obj
+
+    obj = TSP(n_cities=args.cities, population_size=args.population, iterations=args.iterations,
+              mutation_rate=args.mutation_rate, seed=args.seed, plot=args.plot,
+              population_mode=args.mode, seeding=args.seeding, seeding_share=args.seeding_share,
+              crossover_method=args.crossover, selection_method=args.selection, elitism=args.elitism, mutation_method=args.mutation,
+              local_search=args.local_search, workers=args.workers, islands=args.islands,
+              distance_dtype=np.dtype(args.distance_dtype), distance_storage=args.distance_storage,
+              distance_file=args.distance_file, distance_seed=args.distance_seed, instance_file=args.instance, verbosity=args.verbosity,
+              checkpoint_file=args.checkpoint, checkpoint_interval=args.checkpoint_interval, stats_file=args.stats_file,
+              profiling=args.profile, metrics_port=args.metrics_port, fitness_cache_bytes=int(args.fitness_cache_mb * (1 << 20)),
+              live_plot=args.live_plot)
+    obj.run()
+    return obj
+
+
+if __name__ == "__main__":
+    main()
 
@@ -0,0 +1,194 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from TSP import TSP
+
+
+stages = {
+    "array": (
+        "start_population", "evaluate_population", "fitness_matrix", "select_parents_matrix",
+        "perform_crossover_matrix", "apply_mutation_matrix", "apply_local_search", "get_population_results_matrix",
+    ),
+    "dict": (
+        "create_population", "create_population_distances", "compute_distance_of_sample", "fitness",
+        "roulette_wheel", "perform_crossover", "apply_mutation", "get_population_results",
+    ),
+} #population mode -> TSP methods timed by the benchmark, the times are inclusive of the stages they call.
+quality_points = 50 #samples of the best distance versus time kept per case.
+noise_floor = 0.01 #stages that took less seconds in total than this in the baseline are too noisy to compare.
+
+
+def peak_rss_mb() -> float:
+    """
+    Returns the peak resident set size of this process in megabytes.
+    """
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / (1 << 10) #bytes on macOS, kilobytes elsewhere.
+
+def time_stages(tsp, names) -> dict:
+    """
+    Wraps the named methods of tsp so every call adds its duration to the returned {name: {"calls", "seconds"}} dict.
+    """
+    timings = dict()
+    for name in names:
+        method = getattr(tsp, name)
+        timing = timings[name] = {"calls": 0, "seconds": 0.0}
+        def timed(*args, _method=method, _timing=timing, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _method(*args, **kwargs)
+            finally:
+                _timing["calls"] = _timing["calls"] + 1
+                _timing["seconds"] = _timing["seconds"] + time.perf_counter() - start
+        setattr(tsp, name, timed)
+    return timings
+
+def run_case(case) -> dict:
+    """
+    Runs one benchmark case in the current process and returns its results.
+    The cities are seeded uniform random coordinates, so the same case always solves the same instance from the same population.
+    """
+    rng = np.random.default_rng(case["seed"])
+    with tempfile.TemporaryDirectory() as directory:
+        instance = os.path.join(directory, "cities.csv")
+        np.savetxt(instance, rng.uniform(0, case["cities"], size=(case["cities"], 2)), delimiter=",")
+        tsp = TSP(population_size=case["population"], iterations=case["generations"], seed=case["seed"], plot=False,
+                  instance_file=instance, distance_storage=case["distance_storage"], population_mode=case["mode"],
+                  verbosity="quiet", **case["options"])
+
+    timings = time_stages(tsp, stages[case["mode"]])
+    quality = list()
+    def record(tsp, stats):
+        elapsed = time.perf_counter() - start
+        quality.append((elapsed, float(tsp.generations.best_distance)))
+        return elapsed >= case["time_budget"]
+    tsp.add_generation_callback(record)
+
+    start = time.perf_counter()
+    tsp.run()
+    seconds = time.perf_counter() - start
+
+    keep = np.unique(np.linspace(0, len(quality) - 1, min(len(quality), quality_points)).astype(int)) if quality else []
+    return {
+        "cities": case["cities"],
+        "population": case["population"],
+        "mode": case["mode"],
+        "seed": case["seed"],
+        "generations": len(quality),
+        "seconds": seconds,
+        "generations_per_second": len(quality) / seconds if seconds > 0 else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "best_distance": quality[-1][1] if quality else None,
+        "stages": timings,
+        "quality": [quality[k] for k in keep],
+    }
+
+def run_cases(cases, repeats) -> list:
+    """
+    Runs every case repeats times, each time in a fresh process so the peak RSS is its own, and keeps its fastest repeat.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = list()
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for case in cases:
+            runs = pool.map(run_case, [case] * repeats, chunksize=1)
+            best = min(runs, key=lambda run: run["seconds"] / max(1, run["generations"]))
+            best["peak_rss_mb"] = max(run["peak_rss_mb"] for run in runs)
+            results.append(best)
+            print("%(mode)6s %(cities)8d cities %(population)7d routes  %(generations)5d generations  %(generations_per_second)9.2f gen/s  "
+                  "%(peak_rss_mb)8.1f MB  best %(best_distance).1f"%best, flush=True)
+    return results
+
+def compare(results, baseline, tolerance) -> list:
+    """
+    Compares results against the cases of baseline with the same cities, population and mode,
+    and returns a message for every metric that got worse by more than tolerance, a fraction of the baseline value.
+    Stage times are compared per call, so runs stopped by a time budget after a different number of generations still compare,
+    and only for stages above noise_floor.
+    """
+    reference = {(case["cities"], case["population"], case["mode"]): case for case in baseline["cases"]}
+    regressions = list()
+    for case in results:
+        old = reference.get((case["cities"], case["population"], case["mode"]))
+        if old is None:
+            continue
+        label = "%s %d cities %d routes"%(case["mode"], case["cities"], case["population"])
+        checks = [("generations/s", old["generations_per_second"], case["generations_per_second"], False),
+                  ("peak RSS MB", old["peak_rss_mb"], case["peak_rss_mb"], True)]
+        if case["generations"] == old["generations"] and old["best_distance"] is not None:
+            checks.append(("best distance", old["best_distance"], case["best_distance"], True))
+        for name, timing in case["stages"].items():
+            before = old["stages"].get(name)
+            if before and before["calls"] and timing["calls"] and before["seconds"] >= noise_floor:
+                checks.append(("%s s/call"%(name), before["seconds"] / before["calls"], timing["seconds"] / timing["calls"], True))
+        for metric, before, after, lower_is_better in checks:
+            worse = after > before * (1 + tolerance) if lower_is_better else after < before * (1 - tolerance)
+            if worse:
+                regressions.append("%s: %s went from %.6g to %.6g"%(label, metric, before, after))
+    return regressions
+
+def main(argv = None) -> int:
+    """
+    Command line entry point, runs the grid of cases, optionally writes the results to --output and compares them to --baseline.
+    Returns 1 when a regression was found, so it can gate a CI job.
+    """
+    parser = argparse.ArgumentParser(description="Seeded benchmark of the genetic algorithm stages.")
+    parser.add_argument("--cities", type=int, nargs="+", default=[100, 1000, 10000, 50000], help="city counts of the grid.")
+    parser.add_argument("--population", type=int, nargs="+", default=[100, 1000], help="population sizes of the grid.")
+    parser.add_argument("--mode", choices=sorted(stages), nargs="+", default=["array"], help="population modes of the grid.")
+    parser.add_argument("--generations", type=int, default=20, help="generations per case.")
+    parser.add_argument("--time-budget", type=float, default=60.0, help="seconds after which a case stops early.")
+    parser.add_argument("--repeats", type=int, default=1, help="runs per case, the fastest one is kept.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--distance-storage", choices=["auto", "full", "condensed", "lazy"], default="auto",
+                        help="auto keeps a full matrix up to 5000 cities and computes the distances lazily above.")
+    parser.add_argument("--local-search", action="store_true")
+    parser.add_argument("--workers", type=int, default=TSP.workers)
+    parser.add_argument("--output", help="json file the results are written to.")
+    parser.add_argument("--baseline", help="json file of an earlier run to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="relative slowdown flagged as a regression.")
+    args = parser.parse_args(argv)
+
+    cases = list()
+    for mode in args.mode:
+        for cities in args.cities:
+            for population in args.population:
+                storage = args.distance_storage
+                if storage == "auto":
+                    storage = "full" if cities <= 5000 else "lazy"
+                cases.append({"cities": cities, "population": population, "mode": mode, "seed": args.seed,
+                              "generations": args.generations, "time_budget": args.time_budget, "distance_storage": storage,
+                              "options": {"local_search": args.local_search, "workers": args.workers}})
+
+    results = {
+        "environment": {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "settings": vars(args),
+        "cases": run_cases(cases, args.repeats),
+    }
+    if args.output is not None:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=1)
+
+    if args.baseline is None:
+        return 0
+    with open(args.baseline) as handle:
+        regressions = compare(results["cases"], json.load(handle), args.tolerance)
+    for message in regressions:
+        print("[REGRESSION] " + message)
+    if not regressions:
+        print("[INFO] No regressions against %s"%(args.baseline))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
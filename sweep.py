@@ -0,0 +1,205 @@
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from TSP import TSP
+
+
+milestones = 10 #points of the time budget at which runs are compared against each other to prune hopeless ones.
+quality_fractions = (0.1, 0.25, 0.5, 1.0) #fractions of the time budget the table reports the mean best distance at.
+runner_options = ("n_cities", "iterations", "seed", "plot", "verbosity", "workers", "instance_file", "distance_file", "distance_seed") #set by run_config itself.
+shared_best = None #best distance reached by any run at every milestone, set up by attach_shared_best.
+
+
+def attach_shared_best(best) -> None:
+    """
+    Pool initializer, shares the per milestone best distances between the runs.
+    """
+    global shared_best
+    shared_best = best
+
+def parse_param(text) -> tuple:
+    """
+    Parses a name=value,value,... search space entry, values are read as json when they can be, e.g. 0.05, 100 or true, and as strings otherwise.
+    """
+    name, _, values = text.partition("=")
+    if name in runner_options:
+        raise argparse.ArgumentTypeError("%s is set by the sweep itself"%(name))
+    if name not in ("population_size", "mutation_rate"):
+        try:
+            TSP.check_options([name])
+        except TypeError:
+            raise argparse.ArgumentTypeError("unknown parameter %s"%(name))
+    def value(item):
+        try:
+            return json.loads(item)
+        except ValueError:
+            return item
+    return name, [value(item) for item in values.split(",")]
+
+def configurations(space, search, samples, rng) -> list:
+    """
+    Returns the configurations to run, every combination of the search space for a grid search
+    or samples distinct random combinations of it for a random search.
+    """
+    names = list(space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    if search == "grid" or samples >= len(grid):
+        return grid
+    return [grid[k] for k in rng.choice(len(grid), size=samples, replace=False)]
+
+def run_config(task) -> dict:
+    """
+    Evolves one seeded run of a configuration until its time budget or generation limit runs out, its best distance stagnates for patience generations,
+    or it is pruned as hopeless: more than prune_margin worse than the best run at the same milestone of the time budget.
+    Returns the configuration with its best distance over time.
+    """
+    options = dict(task["options"], **task["config"])
+    population_size = options.pop("population_size")
+    mutation_rate = options.pop("mutation_rate", TSP.mutation_rate)
+    tsp = TSP(n_cities=task["cities"], population_size=population_size, iterations=task["generations"], mutation_rate=mutation_rate,
+              seed=task["seed"], plot=False, verbosity="quiet", workers=1, **options)
+
+    budget = task["time_budget"]
+    quality, status, milestone = list(), "finished", 0
+    best, stale = np.inf, 0
+    def observe(tsp, stats):
+        nonlocal status, milestone, best, stale
+        elapsed = time.perf_counter() - start
+        if stats["best_distance"] < best:
+            best, stale = stats["best_distance"], 0
+        else:
+            stale = stale + 1
+        quality.append((elapsed, best))
+
+        while milestone < milestones and elapsed >= budget * (milestone + 1) / milestones:
+            with shared_best.get_lock():
+                leader = shared_best[milestone] = min(shared_best[milestone], best)
+            milestone = milestone + 1
+            if milestone >= 2 and best > leader * (1 + task["prune_margin"]):
+                status = "pruned"
+        if status == "pruned":
+            return True
+        if elapsed >= budget:
+            status = "budget"
+        elif task["patience"] and stale >= task["patience"]:
+            status = "stagnated"
+        return status != "finished"
+
+    tsp.add_generation_callback(observe)
+    start = time.perf_counter()
+    tsp.run()
+
+    times = np.array([t for t, _ in quality])
+    distances = np.array([d for _, d in quality])
+    at = lambda fraction: float(distances[np.searchsorted(times, budget * fraction, side="right") - 1]) if len(times) and times[0] <= budget * fraction else None
+    return {
+        "config": task["config"],
+        "seed": task["seed"],
+        "status": status,
+        "generations": len(quality),
+        "seconds": float(times[-1]) if len(times) else 0.0,
+        "best_distance": float(best),
+        "quality": {fraction: at(fraction) for fraction in quality_fractions},
+        "curve": quality,
+    }
+
+def aggregate(runs, target_gap, time_budget) -> list:
+    """
+    Aggregates the runs of every configuration into a row of the quality versus time table:
+    mean and std of the best distance, mean best distance at every quality fraction of the budget, generations per second,
+    and the mean seconds to get within target_gap of the best distance found by any run, the runs that never do count as the whole time_budget.
+    Rows are sorted by time to target and then mean best distance, so the fastest converging configuration comes first.
+    """
+    target = min(run["best_distance"] for run in runs) * (1 + target_gap)
+    groups = dict()
+    for run in runs:
+        groups.setdefault(json.dumps(run["config"], sort_keys=True), list()).append(run)
+
+    rows = list()
+    for key, group in groups.items():
+        best = np.array([run["best_distance"] for run in group])
+        reached = [next((t for t, d in run["curve"] if d <= target), None) for run in group]
+        row = dict(group[0]["config"])
+        row["runs"] = len(group)
+        row["mean_best"] = float(best.mean())
+        row["std_best"] = float(best.std())
+        for fraction in quality_fractions:
+            values = [run["quality"][fraction] for run in group if run["quality"][fraction] is not None]
+            row["best_at_%g"%(fraction)] = float(np.mean(values)) if values else None
+        row["reached_target"] = sum(t is not None for t in reached)
+        row["time_to_target"] = float(np.mean([time_budget if t is None else t for t in reached]))
+        row["generations_per_second"] = float(np.mean([run["generations"] / run["seconds"] for run in group if run["seconds"] > 0] or [0.0]))
+        row["pruned"] = sum(run["status"] == "pruned" for run in group)
+        rows.append(row)
+    rows.sort(key=lambda row: (-row["reached_target"], row["time_to_target"], row["mean_best"]))
+    return rows
+
+def print_table(rows) -> None:
+    columns = list(rows[0])
+    cell = lambda value: "-" if value is None else "%.2f"%(value) if isinstance(value, float) else str(value)
+    widths = [max(len(column), *(len(cell(row[column])) for row in rows)) for column in columns]
+    print("  ".join(column.rjust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(cell(row[column]).rjust(width) for column, width in zip(columns, widths)))
+
+def main(argv = None) -> list:
+    """
+    Command line entry point, runs every configuration of the search with every seed over a process pool and prints the aggregated table.
+    All the runs solve the same instance, loaded from --instance or drawn once from --instance-seed.
+    """
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep of the genetic algorithm.")
+    parser.add_argument("--param", type=parse_param, action="append", default=list(),
+                        help="search space entry name=value,value,... e.g. population_size=100,500 or elitism=0.02,0.05,0.1.")
+    parser.add_argument("--search", choices=["grid", "random"], default="grid")
+    parser.add_argument("--samples", type=int, default=20, help="configurations drawn by the random search.")
+    parser.add_argument("--cities", type=int, default=100, help="cities of the random instance.")
+    parser.add_argument("--instance", help="TSPLIB .tsp or csv file to sweep on instead of a random instance.")
+    parser.add_argument("--instance-seed", type=int, default=0)
+    parser.add_argument("--seeds", type=int, default=2, help="seeded runs per configuration.")
+    parser.add_argument("--time-budget", type=float, default=30.0, help="seconds per run.")
+    parser.add_argument("--generations", type=int, default=100000, help="generation limit per run.")
+    parser.add_argument("--patience", type=int, default=0, help="generations without improvement that stop a run, 0 never stops.")
+    parser.add_argument("--prune-margin", type=float, default=0.1, help="relative gap to the best run at the same point of the budget that stops a run.")
+    parser.add_argument("--target-gap", type=float, default=0.02, help="relative gap to the best distance found that counts as converged.")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--output", help="csv file the table is written to.")
+    args = parser.parse_args(argv)
+
+    space = {"population_size": [100], **dict(args.param)}
+    rng = np.random.default_rng(args.instance_seed)
+    configs = configurations(space, args.search, args.samples, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        options = {"instance_file": args.instance}
+        if args.instance is None: #draw the random distances once, every run reuses them from the memmap file.
+            options.update(distance_file=os.path.join(directory, "distances.npy"), distance_seed=args.instance_seed)
+            TSP(n_cities=args.cities, population_size=1, iterations=0, seed=args.instance_seed, plot=False, verbosity="quiet", **options)
+        tasks = [{"config": config, "seed": seed, "cities": args.cities, "options": options, "generations": args.generations,
+                  "time_budget": args.time_budget, "patience": args.patience, "prune_margin": args.prune_margin}
+                 for config in configs for seed in range(args.seeds)]
+        print("[INFO] Running %d configurations x %d seeds on %d processes."%(len(configs), args.seeds, args.processes), flush=True)
+
+        best = multiprocessing.Array("d", [np.inf] * milestones)
+        with multiprocessing.Pool(args.processes, initializer=attach_shared_best, initargs=(best,)) as pool:
+            runs = pool.map(run_config, tasks, chunksize=1)
+
+    rows = aggregate(runs, args.target_gap, args.time_budget)
+    print_table(rows)
+    if args.output is not None:
+        with open(args.output, "w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import numpy as np
+
+from TSP import TSP
+
+
+def make_tsp(**options) -> TSP:
+    """
+    Small seeded headless run, options override the defaults.
+    """
+    options = dict(dict(n_cities=40, population_size=30, iterations=10, seed=7, plot=False, verbosity="quiet"), **options)
+    return TSP(**options)
+
+def random_tours(tsp, rows) -> np.ndarray:
+    return np.array([tsp.rng.permutation(tsp.number_of_cities) for _ in range(rows)], dtype=np.int32)
+
+def is_permutation(tours, n) -> bool:
+    return bool((np.sort(tours, axis=1) == np.arange(n)).all())
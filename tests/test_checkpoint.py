@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from TSP import TSP
+from helpers import make_tsp
+
+
+@pytest.mark.parametrize("cache_bytes", [0, 1 << 20])
+def test_checkpoint_resume_is_exact(tmp_path, cache_bytes):
+    options = dict(fitness_cache_bytes=cache_bytes, stats_file=str(tmp_path / "stats.csv"))
+    whole = make_tsp(iterations=30, **dict(options, stats_file=str(tmp_path / "whole.csv")))
+    whole.run()
+
+    checkpoint = str(tmp_path / "run.npz")
+    stopped = make_tsp(iterations=25, checkpoint_file=checkpoint, checkpoint_interval=10, **options)
+    stopped.run()
+    resumed = TSP.resume(checkpoint, iterations=30, verbosity="quiet")
+    resumed.run()
+
+    assert np.array_equal(resumed.population, whole.population)
+    assert np.array_equal(resumed.population_lengths, whole.population_lengths)
+    assert [row["best_path"] for row in resumed.generations] == [row["best_path"] for row in whole.generations]
+    with open(tmp_path / "whole.csv") as expected, open(tmp_path / "stats.csv") as actual:
+        assert actual.read() == expected.read()
+
+def test_resume_restores_the_settings_and_generation(tmp_path):
+    checkpoint = str(tmp_path / "run.npz")
+    make_tsp(iterations=10, crossover_method="pmx", mutation_method="or_opt", elitism=0.1,
+             checkpoint_file=checkpoint, checkpoint_interval=5).run()
+    resumed = TSP.resume(checkpoint, verbosity="quiet")
+    assert (resumed.generation, resumed.iterations) == (10, 10)
+    assert (resumed.crossover_method, resumed.mutation_method, resumed.elitism) == ("pmx", "or_opt", 0.1)
+    assert resumed.generations.count == 10
@@ -0,0 +1,20 @@
+import pytest
+
+from TSP import TSP
+from helpers import make_tsp, random_tours, is_permutation
+
+
+@pytest.mark.parametrize("crossover", sorted(set(TSP.crossover_operators) - {"single_point"})) #single point children are not tours by design.
+def test_crossover_children_are_permutations(crossover):
+    tsp = make_tsp(crossover_method=crossover)
+    first, second = random_tours(tsp, 20), random_tours(tsp, 20)
+    children = getattr(tsp, TSP.crossover_operators[crossover])(first, second)
+    assert children.shape == first.shape
+    assert is_permutation(children, tsp.number_of_cities)
+
+@pytest.mark.parametrize("crossover", sorted(set(TSP.crossover_operators) - {"single_point"}))
+def test_crossover_of_identical_parents_keeps_the_tour(crossover):
+    tsp = make_tsp(crossover_method=crossover)
+    parents = random_tours(tsp, 10)
+    children = getattr(tsp, TSP.crossover_operators[crossover])(parents, parents.copy())
+    assert (children == parents).all()
@@ -0,0 +1,20 @@
+import numpy as np
+
+from helpers import make_tsp, random_tours
+
+
+def test_tour_length_does_not_depend_on_orientation():
+    tsp = make_tsp(fitness_cache_bytes=1 << 20)
+    tour = random_tours(tsp, 1)
+    turned = np.concatenate([np.roll(tour, 13, axis=1), np.roll(tour[:, ::-1], 5, axis=1)])
+    lengths = tsp.compute_population_lengths(turned)
+    assert lengths[0] == lengths[1] == tsp.compute_population_lengths(tour)[0]
+
+def test_cache_hits_equal_fresh_scores():
+    tsp = make_tsp(fitness_cache_bytes=1 << 20)
+    tours = random_tours(tsp, 20)
+    fresh = tsp.compute_population_lengths(tours)
+    tsp.cached_lengths(tours, tsp.compute_population_lengths)
+    turned = np.roll(tours[:, ::-1], 7, axis=1)
+    assert np.array_equal(tsp.cached_lengths(turned, tsp.compute_population_lengths), fresh)
+    assert tsp.fitness_cache.hits == 20
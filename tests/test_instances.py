@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+import pytest
+
+from TSP import TSP
+
+
+ulysses16 = """NAME: ulysses16.tsp
+TYPE: TSP
+DIMENSION: 16
+EDGE_WEIGHT_TYPE: GEO
+NODE_COORD_SECTION
+1 38.24 20.42
+2 39.57 26.15
+3 40.56 25.32
+4 36.26 23.12
+5 33.48 10.54
+6 37.56 12.19
+7 38.42 13.11
+8 37.52 20.44
+9 41.23 9.10
+10 41.17 13.05
+11 36.08 -5.21
+12 38.47 15.13
+13 38.15 15.35
+14 37.51 15.17
+15 35.49 14.32
+16 39.36 19.56
+EOF
+"""
+ulysses16_optimum = ([1, 14, 13, 12, 7, 6, 15, 5, 11, 9, 10, 16, 3, 2, 4, 8], 6859) #published optimal tour and length.
+
+explicit = np.array([[0, 3, 4, 2], [3, 0, 5, 7], [4, 5, 0, 6], [2, 7, 6, 0]], dtype=np.float64)
+
+
+def load(tmp_path, text, **options) -> TSP:
+    path = tmp_path / "instance.tsp"
+    path.write_text(text)
+    return TSP(population_size=4, iterations=1, plot=False, verbosity="quiet", instance_file=str(path), **options)
+
+@pytest.mark.parametrize("storage", ["full", "condensed", "lazy"])
+def test_geo_instance_reproduces_the_published_optimum(tmp_path, storage):
+    tsp = load(tmp_path, ulysses16, distance_storage=storage)
+    tour, optimum = ulysses16_optimum
+    assert tsp.number_of_cities == 16
+    assert tsp.compute_population_lengths(np.array([tour], dtype=np.int32) - 1)[0] == optimum
+
+@pytest.mark.parametrize("layout, cells", [
+    ("FULL_MATRIX", explicit.ravel()),
+    ("UPPER_ROW", explicit[np.triu_indices(4, 1)]),
+    ("LOWER_DIAG_ROW", explicit[np.tril_indices(4)]),
+])
+def test_explicit_weights_layouts(tmp_path, layout, cells):
+    text = "NAME: four\nTYPE: TSP\nDIMENSION: 4\nEDGE_WEIGHT_TYPE: EXPLICIT\nEDGE_WEIGHT_FORMAT: %s\nEDGE_WEIGHT_SECTION\n%s\nEOF\n"%(
+        layout, " ".join("%g"%(value) for value in cells))
+    tsp = load(tmp_path, text)
+    assert np.array_equal(tsp.distances, explicit)
+
+def tsplib_geo(first, second) -> int:
+    """
+    GEO distance as written in the TSPLIB specification, PI = 3.141592 included.
+    """
+    def radians(value):
+        degrees = int(value)
+        return 3.141592 * (degrees + 5.0 * (value - degrees) / 3.0) / 180.0
+    latitude = [radians(first[0]), radians(second[0])]
+    longitude = [radians(first[1]), radians(second[1])]
+    q1 = math.cos(longitude[0] - longitude[1])
+    q2 = math.cos(latitude[0] - latitude[1])
+    q3 = math.cos(latitude[0] + latitude[1])
+    return int(6378.388 * math.acos(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)) + 1.0)
+
+def test_geo_distances_follow_the_tsplib_formula(tmp_path):
+    coordinates = np.round(np.random.default_rng(3).uniform(-80, 80, size=(300, 2)), 2)
+    text = "NAME: geo\nTYPE: TSP\nDIMENSION: 300\nEDGE_WEIGHT_TYPE: GEO\nNODE_COORD_SECTION\n%s\nEOF\n"%(
+        "\n".join("%d %.2f %.2f"%(k + 1, x, y) for k, (x, y) in enumerate(coordinates)))
+    tsp = load(tmp_path, text, distance_storage="lazy")
+    i, j = np.triu_indices(300, 1)
+    expected = [tsplib_geo(coordinates[a], coordinates[b]) for a, b in zip(i, j)]
+    assert np.array_equal(tsp.edge_lengths(i, j), expected)
+
+def test_unsupported_edge_weight_type_is_rejected(tmp_path):
+    path = tmp_path / "instance.tsp"
+    path.write_text("NAME: x\nTYPE: TSP\nDIMENSION: 2\nEDGE_WEIGHT_TYPE: CEIL_2D\nNODE_COORD_SECTION\n1 0 0\n2 1 1\nEOF\n")
+    with pytest.raises(ValueError):
+        TSP.__new__(TSP).load_instance(str(path))
@@ -0,0 +1,20 @@
+import pytest
+
+from helpers import make_tsp
+
+
+@pytest.mark.parametrize("islands", [2, 3, 4, 7])
+def test_random_migration_never_targets_the_sender(islands):
+    tsp = make_tsp(islands=islands, migration_topology="random")
+    tsp.migration_seed = 11
+    for epoch in range(100):
+        targets = [tsp.migration_target(island, epoch) for island in range(islands)]
+        assert sorted(targets) == list(range(islands))
+        assert all(target != island for island, target in enumerate(targets))
+
+def test_run_returns_the_island_results():
+    tsp = make_tsp(islands=2, iterations=12, migration_interval=5)
+    result = tsp.run()
+    assert len(result["islands"]) == 2
+    assert result["best_distance"] == min(history.best_distance for history in result["islands"])
+    assert result["best_distance"] == pytest.approx(tsp.generations.best_distance)
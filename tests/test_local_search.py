@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from helpers import make_tsp, random_tours, is_permutation
+
+
+def make_instance(tmp_path, storage):
+    if storage == "random":
+        return make_tsp(n_cities=60)
+    instance = tmp_path / "cities.csv"
+    np.savetxt(instance, np.random.default_rng(5).uniform(0, 100, size=(60, 2)), delimiter=",")
+    return make_tsp(instance_file=str(instance), distance_storage=storage)
+
+@pytest.mark.parametrize("storage", ["random", "full", "condensed", "lazy"])
+def test_improve_tour_delta_matches_rescore(tmp_path, storage):
+    tsp = make_instance(tmp_path, storage)
+    tsp.build_neighbor_lists(tsp.neighbor_count)
+    for tour in random_tours(tsp, 10):
+        before = tsp.compute_population_lengths(tour[None])[0]
+        improved, delta, moves = tsp.improve_tour(tour, np.inf, None)
+        improved = np.asarray(improved, dtype=np.int32)[None]
+        assert is_permutation(improved, tsp.number_of_cities)
+        assert moves > 0 and delta < 0
+        assert before + delta == pytest.approx(tsp.compute_population_lengths(improved)[0], abs=1e-6)
+
+def test_improve_tour_respects_the_move_budget():
+    tsp = make_tsp(n_cities=60)
+    tsp.build_neighbor_lists(tsp.neighbor_count)
+    tour = random_tours(tsp, 1)[0]
+    _, _, moves = tsp.improve_tour(tour, 3, None)
+    assert moves <= 3
+
+def test_local_search_updates_the_cached_lengths():
+    tsp = make_tsp(n_cities=60, local_search=True)
+    population = random_tours(tsp, 20)
+    lengths = tsp.compute_population_lengths(population)
+    population, lengths = tsp.apply_local_search(population, lengths.copy())
+    assert is_permutation(population, tsp.number_of_cities)
+    np.testing.assert_allclose(lengths, tsp.compute_population_lengths(population), rtol=0, atol=1e-6)
@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+from TSP import TSP
+from helpers import make_tsp, random_tours, is_permutation
+
+
+@pytest.mark.parametrize("mutation", sorted(TSP.mutation_operators))
+def test_mutation_delta_matches_rescore(mutation):
+    tsp = make_tsp()
+    tours = random_tours(tsp, 50)
+    before = tsp.compute_population_lengths(tours)
+    delta = getattr(tsp, TSP.mutation_operators[mutation])(tours)
+    assert is_permutation(tours, tsp.number_of_cities)
+    np.testing.assert_allclose(before + delta, tsp.compute_population_lengths(tours), rtol=0, atol=1e-6)
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from TSP import TSP, CityGrid
+from helpers import make_tsp, is_permutation
+
+
+@pytest.mark.parametrize("cities", [2, 5, 200])
+def test_nearest_k_matches_brute_force(cities):
+    coordinates = np.random.default_rng(cities).uniform(0, 100, size=(cities, 2))
+    k = min(6, cities - 1)
+    nearest = CityGrid(coordinates).nearest_k(k)
+    squared = ((coordinates[:, None, :] - coordinates[None, :, :]) ** 2).sum(axis=2)
+    np.fill_diagonal(squared, np.inf)
+    expected = np.sort(squared, axis=1)[:, :k]
+    assert np.array_equal(np.sort(np.take_along_axis(squared, nearest, axis=1), axis=1), expected)
+
+@pytest.mark.parametrize("planar", [False, True])
+@pytest.mark.parametrize("seeding", sorted(TSP.seeding_operators))
+def test_seeded_population_is_made_of_tours(tmp_path, seeding, planar):
+    options = dict(seeding=seeding, seeding_share=0.5)
+    if planar:
+        instance = tmp_path / "cities.csv"
+        np.savetxt(instance, np.random.default_rng(1).uniform(0, 100, size=(60, 2)), delimiter=",")
+        options["instance_file"] = str(instance)
+    tsp = make_tsp(**options)
+    population = tsp.create_population_matrix(tsp.population_size)
+    assert population.shape == (tsp.population_size, tsp.number_of_cities)
+    assert is_permutation(population, tsp.number_of_cities)
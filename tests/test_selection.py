@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from TSP import TSP
+from helpers import make_tsp, is_permutation
+
+
+@pytest.mark.parametrize("selection", sorted(TSP.selection_operators))
+def test_selection_returns_count_parents(selection):
+    tsp = make_tsp(selection_method=selection)
+    lengths = tsp.rng.uniform(100, 200, size=30)
+    parents = getattr(tsp, TSP.selection_operators[selection])(lengths, tsp.fitness_matrix(lengths), 38)
+    assert len(parents) == 38
+    assert ((parents >= 0) & (parents < 30)).all()
+
+@pytest.mark.parametrize("selection", sorted(TSP.selection_operators))
+def test_selection_evolves_a_generation(selection):
+    tsp = make_tsp(selection_method=selection)
+    tsp.start_population()
+    stats = tsp.evolve_generation()
+    assert stats is not None
+    assert is_permutation(tsp.population, tsp.number_of_cities)
+    np.testing.assert_allclose(tsp.population_lengths, tsp.compute_population_lengths(tsp.population), rtol=0, atol=1e-6)
+    assert stats["best_distance"] == pytest.approx(tsp.population_lengths.min(), abs=1e-4)
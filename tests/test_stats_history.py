@@ -0,0 +1,42 @@
+import numpy as np
+
+from TSP import StatsHistory
+
+
+def stats(generation, best_distance) -> dict:
+    return {"generation": generation, "best_distance": best_distance, "best_fitness": 1.0 / best_distance,
+            "average_distance": best_distance + 10, "std_distance": 1.0, "average_fitness": 0.5, "diversity": 0.25,
+            "best_path": "%d,1,2"%(generation)}
+
+def fill(history, distances) -> None:
+    for generation, distance in enumerate(distances, start=1):
+        history.append(stats(generation, distance))
+
+def test_ring_buffer_keeps_the_last_capacity_rows_in_order():
+    history = StatsHistory(capacity=4)
+    fill(history, [10.0, 9.0, 9.5, 8.0, 7.5, 7.9, 7.0])
+    assert len(history) == 4 and history.count == 7
+    assert [row["generation"] for row in history] == [4, 5, 6, 7]
+    assert history[-1]["generation"] == 7 and history[0]["generation"] == 4
+    assert np.array_equal(history.column("best_distance"), [8.0, 7.5, 7.9, 7.0])
+
+def test_best_path_is_the_last_improvement_up_to_each_row():
+    history = StatsHistory(capacity=4)
+    fill(history, [10.0, 9.0, 9.5, 8.0, 8.5, 8.7, 7.0])
+    assert [row["best_path"] for row in history] == ["4,1,2", "4,1,2", "4,1,2", "7,1,2"]
+    assert history.best_path() == "7,1,2"
+    assert history.best_distance == 7.0
+
+def test_improvements_older_than_the_buffer_are_dropped():
+    history = StatsHistory(capacity=3)
+    fill(history, np.linspace(100, 1, 50))
+    assert len(history.best_rows) <= 4
+    assert history.best_rows == sorted(history.best_rows)
+    assert [row["best_path"] for row in history] == ["48,1,2", "49,1,2", "50,1,2"]
+
+def test_arrays_round_trip():
+    history = StatsHistory(capacity=4)
+    fill(history, [10.0, 9.0, 9.5, 8.0, 8.5, 8.7])
+    rebuilt = StatsHistory.from_arrays(history.to_arrays())
+    assert list(rebuilt) == list(history)
+    assert rebuilt.best_distance == history.best_distance and rebuilt.count == history.count
@@ -0,0 +1,20 @@
+import numpy as np
+
+from helpers import make_tsp
+
+
+def test_step_releases_the_workers_after_the_last_generation():
+    tsp = make_tsp(iterations=3, workers=2, chunk_size=8)
+    serial = make_tsp(iterations=3)
+    for _ in range(3):
+        tsp.step()
+        serial.step()
+    assert tsp.pool is None and tsp.shared_distances is None
+    assert np.array_equal(tsp.population, serial.population)
+    np.testing.assert_allclose(tsp.population_lengths, serial.population_lengths, rtol=0, atol=1e-6)
+
+def test_close_releases_the_workers_of_a_stopped_run():
+    with make_tsp(iterations=30, workers=2, chunk_size=8) as tsp:
+        tsp.step()
+        assert tsp.pool is not None and tsp.shared_distances is not None
+    assert tsp.pool is None and tsp.shared_distances is None